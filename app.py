@@ -1,14 +1,22 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import asyncio
-import nest_asyncio
+import time
 import warnings
-import re
 
-from src.database import init_db, insert_job, load_all_jobs, save_to_csv
-from src.scraper import SeleniumScraper, LinkedInScraper
-from src.analytics_engine import extract_skills, clean_location
+from src.database import get_conn, load_recent_jobs, search_jobs
+from src.rollups import load_rollup, count_rollup_values
+from src.job_queue import (
+    enqueue_scrape_job,
+    get_scrape_job,
+    list_schedules,
+    schedule_run_history,
+    set_schedule_enabled,
+)
+from src.scheduler import create_schedule
+from src.tracing import Run
+from src.analytics_engine import extract_skills, top_skills
+from src.normalize import clean_location, EXP_BUCKETS, UNKNOWN
 from src.recommender import get_recommendations
 
 st.set_page_config(
@@ -16,7 +24,6 @@ st.set_page_config(
     page_icon="",
     layout="wide"
 )
-nest_asyncio.apply()
 warnings.filterwarnings("ignore")
 
 if "page" not in st.session_state:
@@ -29,9 +36,26 @@ if "scraped_data_private" not in st.session_state:
 if "scrape_counts" not in st.session_state:
     st.session_state.scrape_counts = {"Indeed": 0, "Naukri": 0, "LinkedIn": 0}
 
+if "scrape_trace" not in st.session_state:
+    st.session_state.scrape_trace = None
+
 if "govt_data" not in st.session_state:
     st.session_state.govt_data = None
 
+if "active_jobs" not in st.session_state:
+    # Restore jobs started before a tab reload from the URL.
+    st.session_state.active_jobs = {
+        kind: int(st.query_params[f"{kind}_job"])
+        for kind in ("private", "govt")
+        if st.query_params.get(f"{kind}_job", "").isdigit()
+    }
+
+if "finished_jobs" not in st.session_state:
+    st.session_state.finished_jobs = {}
+
+JOB_POLL_SECONDS = 2
+PRIVATE_SITES = ["LinkedIn", "Indeed", "Naukri"]
+
 
 px.defaults.template = "plotly_dark"
 px.defaults.color_discrete_sequence = px.colors.qualitative.Set2
@@ -150,54 +174,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def bucket_exp(x):
-    x = x.lower().strip()
-
-    if x in ["n/a", "", "not disclosed", "unknown"]:
-        return "Unknown"
-
-    if "fresher" in x:
-        return "0-1 years"
-
-    nums = re.findall(r'\d+', x)
-    if len(nums) == 0:
-        return "Unknown"
-
-    nums = [int(n) for n in nums]
-    low = nums[0]
-    high = nums[1] if len(nums) > 1 else nums[0]
-
-    if high <= 1:
-        return "0-1 years"
-    elif high <= 3:
-        return "1-3 years"
-    elif high <= 5:
-        return "3-5 years"
-    elif high <= 10:
-        return "5-10 years"
-    else:
-        return "10+ years"
-
-
-def normalize_private_exp(x):
-    x = x.lower().strip()
-
-    if x in ["n/a", "", "not disclosed"]:
-        return "Unknown"
-
-    if "fresher" in x:
-        return "0 years"
-
-    nums = re.findall(r'\d+', x)
-    if len(nums) == 0:
-        return "Unknown"
-    elif len(nums) == 1:
-        return f"{nums[0]} years"
-    else:
-        return f"{nums[0]}-{nums[1]} years"
-    
-
-
 def render_resource_card(item, type_label):
     img_url = item.get("thumbnail")
     if not img_url or "http" not in img_url:
@@ -216,84 +192,166 @@ def render_resource_card(item, type_label):
     """
 
 
-async def run_hybrid_scrape(keyword, location, limit, time_filter, work_type, exp_level,
-                            use_indeed, use_naukri, use_linkedin):
-    jobs = []
-    status_text = st.empty()
-    progress_bar = st.progress(0)
-    conn = init_db()
+def set_active_job(kind, job_id):
+    st.session_state.active_jobs[kind] = job_id
+    st.query_params[f"{kind}_job"] = str(job_id)
 
-    counts = {"Indeed": 0, "Naukri": 0, "LinkedIn": 0}
 
-    if use_indeed or use_naukri:
-        sel_scraper = SeleniumScraper()
+def clear_active_job(kind):
+    st.session_state.active_jobs.pop(kind, None)
+    if f"{kind}_job" in st.query_params:
+        del st.query_params[f"{kind}_job"]
 
-        if use_indeed:
-            status_text.text("Running Indeed Scraper...")
-            try:
-                res = sel_scraper.scrape_indeed(keyword, limit, time_filter)
-                jobs.extend(res)
-                counts["Indeed"] = len(res)
-                for j in res:
-                    insert_job(conn, j)
-                    save_to_csv(j)
-            except Exception as e:
-                print("[Indeed Scraper Error]", e)
-            progress_bar.progress(33)
-
-        if use_naukri:
-            status_text.text("Running Naukri Scraper...")
-            try:
-                res = sel_scraper.scrape_naukri(keyword, location, limit)
-                jobs.extend(res)
-                counts["Naukri"] = len(res)
-                for j in res:
-                    insert_job(conn, j)
-                    save_to_csv(j)
-            except Exception as e:
-                print("[Naukri Scraper Error]", e)
-            progress_bar.progress(66)
-
-    if use_linkedin:
-        status_text.text("Running LinkedIn Scraper...")
-        lnk_scraper = LinkedInScraper()
-        try:
-            res = await lnk_scraper.scrape(
-                keyword, location, limit, time_filter, work_type, exp_level
-            )
-            jobs.extend(res)
-            counts["LinkedIn"] = len(res)
-            for j in res:
-                insert_job(conn, j)
-                save_to_csv(j)
-        except Exception as e:
-            print("[LinkedIn Scraper Error]", e)
-        progress_bar.progress(90)
 
-    conn.close()
-    progress_bar.progress(100)
-    status_text.empty()
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def poll_scrape_job(kind):
+    """
+    Shows the status of this session's background scrape of the given kind
+    and re-polls it every JOB_POLL_SECONDS without rerunning the rest of the
+    page. Once the job has ended it is moved to finished_jobs and the whole
+    page reruns to show it.
+    """
+    job_id = st.session_state.active_jobs.get(kind)
+    if job_id is None:
+        return
+
+    job = get_scrape_job(get_conn(), job_id)
+
+    if job is None:
+        clear_active_job(kind)
+        return
+
+    if job["status"] == "queued":
+        st.info(
+            f"Scrape #{job_id} is queued. Waiting for a worker "
+            "(start one with `python -m src.worker`)."
+        )
+        return
+
+    if job["status"] == "running":
+        st.progress(job["progress"], text=job["message"] or "Scraping...")
+        return
+
+    clear_active_job(kind)
+    st.session_state.finished_jobs[kind] = job
+    st.rerun()
 
-    return pd.DataFrame(jobs), counts
+
+def take_finished_job(kind):
+    """
+    Returns this session's scrape of the given kind if it has just finished
+    successfully, otherwise None.
+    """
+    job = st.session_state.finished_jobs.pop(kind, None)
+    if job is None:
+        return None
+
+    if job["status"] == "failed":
+        st.error(f"Scrape #{job['id']} failed: {job['error']}")
+        return None
+
+    return job
+
+
+def parse_batch_queries(text, default_location):
+    queries = []
+    seen = set()
+    for line in text.splitlines():
+        keyword, _, loc = line.partition("|")
+        keyword, loc = keyword.strip(), loc.strip() or default_location
+        if keyword and (keyword.lower(), loc.lower()) not in seen:
+            seen.add((keyword.lower(), loc.lower()))
+            queries.append({"keyword": keyword, "location": loc})
+    return queries
+
+
+def render_schedule_panel(kind, params, default_name):
+    with st.expander("Schedule this scrape"):
+        name = st.text_input("Schedule name", default_name, key=f"{kind}_sched_name")
+        cron = st.text_input(
+            "Cron (UTC) or @every 30m",
+            "@hourly",
+            key=f"{kind}_sched_cron",
+        )
+        jitter = st.slider(
+            "Start jitter (minutes)", 0, 30, 5, key=f"{kind}_sched_jitter"
+        )
+
+        conn = get_conn()
+        if st.button("Save schedule", key=f"{kind}_sched_save"):
+            try:
+                create_schedule(conn, name, kind, params, cron, jitter * 60)
+                st.success("Saved. Run `python -m src.scheduler` to execute schedules.")
+            except ValueError as e:
+                st.error(f"Invalid schedule: {e}")
+
+        schedules = [s for s in list_schedules(conn) if s["kind"] == kind]
+        for sched in schedules:
+            runs = schedule_run_history(conn, sched["id"], limit=5)
+            enabled = st.checkbox(
+                f"{sched['name']} ({sched['cron']})",
+                value=bool(sched["enabled"]),
+                key=f"sched_enabled_{sched['id']}",
+            )
+            if enabled != bool(sched["enabled"]):
+                set_schedule_enabled(conn, sched["id"], enabled)
+
+            st.caption(f"Next run: {sched['next_run_at'] or 'pending'} UTC")
+            if runs:
+                st.dataframe(
+                    pd.DataFrame(runs)[["id", "status", "started_at", "duration_s", "row_count"]],
+                    hide_index=True,
+                    use_container_width=True,
+                )
 
 
-async def run_govt_scrape(limit, state_filter="None"):
-    sel_scraper = SeleniumScraper()
-    query = state_filter if state_filter.strip() else "None"
-    jobs = sel_scraper.scrape_jobkaka(limit, query)
+def render_run_diagnostics(trace, analyze_run):
+    with st.expander("Run diagnostics"):
+        if trace:
+            st.caption(
+                f"Run {trace['run_id']} started {trace['started_at']}, "
+                f"took {trace['duration_s']:.1f}s"
+            )
+            if trace["sites"]:
+                st.markdown("**Per site**")
+                st.dataframe(
+                    pd.DataFrame.from_dict(trace["sites"], orient="index"),
+                    use_container_width=True,
+                )
+        else:
+            st.caption("No trace was recorded for this scrape.")
+
+        stages = dict(trace["spans"]) if trace else {}
+        stages.update(analyze_run.summary()["spans"])
+        if stages:
+            st.markdown("**Per stage**")
+            st.dataframe(
+                pd.DataFrame.from_dict(stages, orient="index").sort_values(
+                    "total_s", ascending=False
+                ),
+                use_container_width=True,
+            )
 
-    conn = init_db()
-    for j in jobs:
-        insert_job(conn, j)
 
-    conn.close()
+def drop_duplicate_postings(df):
+    """
+    Keeps one posting per near-duplicate cluster. Jobs the database didn't
+    cluster (e.g. without a URL) fall back to matching title and company.
+    """
+    if "cluster_id" not in df.columns:
+        return df.drop_duplicates(subset=["Title", "Company"])
 
-    return pd.DataFrame(jobs)
+    clustered = df["cluster_id"].notna()
+    return pd.concat([
+        df[clustered].drop_duplicates(subset=["cluster_id"]),
+        df[~clustered].drop_duplicates(subset=["Title", "Company"]),
+    ]).sort_index()
 
 
 def show_private_results_page(keyword):
     df = st.session_state.scraped_data_private
     counts = st.session_state.scrape_counts
+    analyze_run = Run("analyze", rows=0 if df is None else len(df))
 
     if df is None or df.empty:
         st.error("No scraped data available. Please run a new scrape.")
@@ -320,8 +378,7 @@ def show_private_results_page(keyword):
         "date_posted": "Date Posted"
     })
 
-    if "Title" in df.columns and "Company" in df.columns:
-        df.drop_duplicates(subset=["Title", "Company"], inplace=True)
+    df = drop_duplicate_postings(df)
 
     st.success(f"Scraped & analyzed {len(df)} fresh job postings.")
 
@@ -349,6 +406,13 @@ def show_private_results_page(keyword):
     p2.metric("Indeed Jobs", counts["Indeed"])
     p3.metric("Naukri Jobs", counts["Naukri"])
 
+    if "query" in df.columns and df["query"].nunique() > 1:
+        with st.expander("Jobs per query"):
+            st.dataframe(
+                df.groupby(["query", "Platform"]).size().unstack(fill_value=0),
+                use_container_width=True,
+            )
+
     tab1, tab2, tab3 = st.tabs(
         ["Market Data (This Run)", "Raw Data", "Learning Path"]
     )
@@ -358,7 +422,8 @@ def show_private_results_page(keyword):
 
         with c1:
             st.subheader("Top Skills in Current Search")
-            skills_df = extract_skills(df)
+            with analyze_run.span("analyze.extract_skills", rows=len(df)):
+                skills_df = extract_skills(df)
             if not skills_df.empty:
                 fig = px.scatter(
                     skills_df,
@@ -376,7 +441,8 @@ def show_private_results_page(keyword):
 
         with c2:
             st.subheader("Location Spread")
-            df["Clean_Loc"] = df["Location"].apply(clean_location)
+            with analyze_run.span("analyze.clean_location", rows=len(df)):
+                df["Clean_Loc"] = df["Location"].apply(clean_location)
             fig_loc = px.pie(
                 df,
                 names="Clean_Loc",
@@ -401,7 +467,8 @@ def show_private_results_page(keyword):
     with tab3:
         st.subheader("Curated Learning Path")
 
-        skills_df = extract_skills(df)
+        with analyze_run.span("analyze.extract_skills", rows=len(df)):
+            skills_df = extract_skills(df)
         if not skills_df.empty:
             top_skill = skills_df.iloc[0]["Skill"]
             topic = f"{top_skill} course"
@@ -410,7 +477,8 @@ def show_private_results_page(keyword):
             topic = f"{keyword} tutorial"
 
         with st.spinner("Fetching learning resources..."):
-            resources = get_recommendations(topic)
+            with analyze_run.span("analyze.recommendations"):
+                resources = get_recommendations(topic)
 
         c1, c2, c3 = st.columns(3)
 
@@ -447,6 +515,56 @@ def show_private_results_page(keyword):
             else:
                 st.info("No paid courses found.")
 
+    render_run_diagnostics(st.session_state.scrape_trace, analyze_run)
+
+
+# Top skills across private-site jobs, from the rollup tables (one posting
+# per near-duplicate cluster).
+def history_top_skills(conn):
+    return top_skills(load_rollup(conn, "skill", PRIVATE_SITES, limit=20).to_dict())
+
+
+SEARCH_PAGE_SIZE = 20
+
+
+def render_job_search():
+    st.subheader("Search Historical Jobs")
+
+    s1, s2, s3 = st.columns([4, 2, 1])
+    query = s1.text_input(
+        "Search", placeholder="e.g. data engineer spark, or kube* for prefixes",
+        key="job_search_query", label_visibility="collapsed",
+    )
+    exp_filter = s2.selectbox(
+        "Experience", ["Any"] + EXP_BUCKETS, key="job_search_exp", label_visibility="collapsed"
+    )
+    page = s3.number_input("Page", min_value=1, value=1, step=1, key="job_search_page")
+
+    if not query.strip():
+        return
+
+    filters = {"site": PRIVATE_SITES}
+    if exp_filter != "Any":
+        filters["exp_bucket"] = exp_filter
+
+    start = time.perf_counter()
+    results = search_jobs(
+        query, filters, limit=SEARCH_PAGE_SIZE, offset=(page - 1) * SEARCH_PAGE_SIZE
+    )
+    elapsed_ms = 1000 * (time.perf_counter() - start)
+
+    if results.empty:
+        st.info("No matching jobs found.")
+        return
+
+    st.caption(f"Page {page}: {len(results)} results in {elapsed_ms:.0f} ms, best matches first")
+    st.dataframe(
+        results[["title", "company", "location", "site", "date_posted", "snippet", "job_url"]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={"job_url": st.column_config.LinkColumn("Link")},
+    )
+
 
 def show_private_home_page():
     st.markdown(
@@ -470,62 +588,42 @@ def show_private_home_page():
     st.markdown("---")
     st.subheader("Historical Market Insights (Private)")
 
-    df_hist = load_all_jobs()
+    # The dashboards read the rollup tables insert_jobs keeps up to date,
+    # so their cost doesn't grow with the number of stored jobs.
+    conn = get_conn()
 
-    if df_hist.empty:
+    if load_rollup(conn, "site").sum() == 0:
         st.warning("No historical data available yet. Run a scrape to start building your dataset.")
         return
 
-    if "site" in df_hist.columns:
-        df_hist = df_hist[df_hist["site"].isin(["LinkedIn", "Indeed", "Naukri"])]
-
-    if df_hist.empty:
+    site_counts = load_rollup(conn, "site", PRIVATE_SITES)
+    total_jobs = int(site_counts.sum())
+    if total_jobs == 0:
         st.warning("Historical data exists but none from private platforms yet.")
         return
 
-    expected_hist = [
-        "title", "company", "location", "salary",
-        "experience", "description", "date_posted", "site"
-    ]
-    for col in expected_hist:
-        if col not in df_hist.columns:
-            df_hist[col] = "Not Disclosed"
-
-    df_hist = df_hist.rename(columns={
-        "title": "Title",
-        "company": "Company",
-        "location": "Location",
-        "site": "Platform",
-        "salary": "Salary",
-        "experience": "Experience",
-        "date_posted": "Date Posted"
-    })
-
-    if "Title" in df_hist.columns and "Company" in df_hist.columns:
-        df_hist.drop_duplicates(subset=["Title", "Company"], inplace=True)
-
-    st.success(f"Loaded {len(df_hist)} private-sector historical job entries.")
+    st.success(f"Loaded {total_jobs} private-sector historical job entries.")
     h1, h2, h3 = st.columns(3)
     h1.markdown(
         f"<div class='metric-label'>Unique Companies</div>"
-        f"<div class='metric-value'>{df_hist['Company'].nunique()}</div>",
+        f"<div class='metric-value'>{count_rollup_values(conn, 'company', PRIVATE_SITES)}</div>",
         unsafe_allow_html=True
     )
     h2.markdown(
         f"<div class='metric-label'>Distinct Locations</div>"
-        f"<div class='metric-value'>{df_hist['Location'].nunique()}</div>",
+        f"<div class='metric-value'>{count_rollup_values(conn, 'location', PRIVATE_SITES)}</div>",
         unsafe_allow_html=True
     )
     h3.markdown(
         f"<div class='metric-label'>Platforms Used</div>"
-        f"<div class='metric-value'>{df_hist['Platform'].nunique()}</div>",
+        f"<div class='metric-value'>{len(site_counts)}</div>",
         unsafe_allow_html=True
     )
 
     st.markdown("---")
 
     st.subheader("Top Skills from Historical Data")
-    skills_df = extract_skills(df_hist)
+    skills_df = history_top_skills(conn)
     if not skills_df.empty:
         fig = px.bar(
             skills_df,
@@ -542,7 +640,7 @@ def show_private_home_page():
 
     with c1:
         st.subheader("Top Hiring Companies")
-        comp_counts = df_hist["Company"].value_counts().head(15)
+        comp_counts = load_rollup(conn, "company", PRIVATE_SITES, limit=15)
         fig = px.bar(
             comp_counts,
             orientation="h",
@@ -554,21 +652,12 @@ def show_private_home_page():
     with c2:
         st.subheader("Experience Requirements")
 
-        df_hist["Exp_Clean"] = df_hist["Experience"].apply(bucket_exp)
-        df_exp = df_hist[df_hist["Exp_Clean"] != "Unknown"]
+        exp_counts = load_rollup(conn, "exp_bucket", PRIVATE_SITES, exclude=(UNKNOWN,))
 
-        if df_exp.empty:
+        if exp_counts.empty:
             st.info("No valid experience data available.")
         else:
-            bucket_order = ["0-1 years", "1-3 years", "3-5 years", "5-10 years", "10+ years"]
-
-            exp_counts = (
-                df_exp["Exp_Clean"]
-                .value_counts()
-                .reindex(bucket_order, fill_value=0)
-                .reset_index()
-            )
-
+            exp_counts = exp_counts.reindex(EXP_BUCKETS, fill_value=0).reset_index()
             exp_counts.columns = ["Experience", "Count"]
 
             fig = px.bar(
@@ -579,7 +668,7 @@ def show_private_home_page():
             )
 
             fig.update_layout(
-                xaxis={'categoryorder':'array', 'categoryarray': bucket_order},
+                xaxis={'categoryorder':'array', 'categoryarray': EXP_BUCKETS},
                 margin=dict(l=10, r=10, t=40, b=10)
             )
 
@@ -590,8 +679,7 @@ def show_private_home_page():
 
     with c3:
         st.subheader("Job Distribution by Location")
-        df_hist["Clean_Loc"] = df_hist["Location"].apply(clean_location)
-        loc_counts = df_hist["Clean_Loc"].value_counts().head(15)
+        loc_counts = load_rollup(conn, "location", PRIVATE_SITES, limit=15)
         fig = px.bar(
             loc_counts,
             orientation="h",
@@ -603,14 +691,18 @@ def show_private_home_page():
     with c4:
         st.subheader("Jobs per Platform")
         fig = px.pie(
-            df_hist,
-            names="Platform",
+            names=site_counts.index,
+            values=site_counts.values,
             title="Jobs by Platform (Historical)"
         )
         fig.update_layout(margin=dict(l=10, r=10, t=40, b=10))
         st.plotly_chart(fig, use_container_width=True)
 
+    render_job_search()
+
     with st.expander("Peek at raw historical data"):
+        df_hist = load_recent_jobs(conn, PRIVATE_SITES)
+        st.caption(f"Latest {len(df_hist)} entries")
         st.dataframe(df_hist, use_container_width=True, height=400)
 
 
@@ -681,9 +773,22 @@ with st.sidebar:
 
     if portal_mode == "Private / Corporate":
         st.header("Private Scraper Settings")
-        keyword = st.text_input("Job Role", "Data Scientist")
+        batch_mode = st.checkbox("Batch mode (several roles in one run)", value=False)
+        if batch_mode:
+            batch_text = st.text_area(
+                "Job Roles (one per line, optionally 'role | location')",
+                "Data Scientist\nData Analyst\nML Engineer",
+            )
+        keyword = st.text_input("Job Role", "Data Scientist", disabled=batch_mode)
         location = st.text_input("Location", "India")
 
+        queries = None
+        if batch_mode:
+            queries = parse_batch_queries(batch_text, location)
+            if queries:
+                keyword = queries[0]["keyword"]
+            st.caption(f"{len(queries)} queries")
+
         st.subheader("Filters")
         time_filter = st.selectbox(
             "Date Posted",
@@ -705,8 +810,42 @@ with st.sidebar:
         use_linkedin = st.checkbox("LinkedIn", value=True)
         use_indeed = st.checkbox("Indeed", value=True)
         use_naukri = st.checkbox("Naukri", value=True)
+        lean_mode = st.checkbox(
+            "Lean mode (skip images, fonts & trackers)", value=False
+        )
+        incremental_mode = st.checkbox(
+            "Incremental (skip postings already saved)", value=False
+        )
+        fetch_descriptions = st.checkbox(
+            "Fetch full job descriptions", value=False
+        )
+        resume_scrape = st.checkbox(
+            "Resume an interrupted Indeed/Naukri scrape", value=False
+        )
+        record_pages = st.checkbox(
+            "Record pages for parser benchmarks", value=False
+        )
+
+        private_params = {
+            "keyword": keyword,
+            "location": location,
+            "limit": limit,
+            "time_filter": time_filter,
+            "work_type": work_type,
+            "exp_level": exp_level,
+            "use_indeed": use_indeed,
+            "use_naukri": use_naukri,
+            "use_linkedin": use_linkedin,
+            "lean": lean_mode,
+            "incremental": incremental_mode,
+            "fetch_descriptions": fetch_descriptions,
+            "resume": resume_scrape,
+            "queries": queries,
+            "record": record_pages,
+        }
 
         scrape_btn_private = st.button("Start Scraping", type="primary")
+        render_schedule_panel("private", private_params, f"{keyword} in {location}")
 
     else:
         st.header("Government Job Filters")
@@ -715,7 +854,11 @@ with st.sidebar:
             placeholder="e.g. Maharashtra"
         )
         g_limit = st.slider("Number of Notifications", 10, 50, 20)
+        govt_record = st.checkbox("Record pages for parser benchmarks", value=False)
+        govt_params = {"limit": g_limit, "state_filter": govt_location, "record": govt_record}
+
         scrape_btn_govt = st.button("Fetch Govt Jobs", type="primary")
+        render_schedule_panel("govt", govt_params, f"Govt {govt_location or 'all states'}")
 
 
 if portal_mode == "Private / Corporate":
@@ -740,23 +883,24 @@ if portal_mode == "Private / Corporate":
     if "scrape_btn_private" in locals() and scrape_btn_private:
         if not (use_linkedin or use_indeed or use_naukri):
             st.error("Please select at least one website.")
+        elif batch_mode and not queries:
+            st.error("Please enter at least one job role.")
         else:
-            with st.spinner("Scraping live job listings..."):
-                df, counts = asyncio.run(
-                    run_hybrid_scrape(
-                        keyword, location, limit,
-                        time_filter, work_type, exp_level,
-                        use_indeed, use_naukri, use_linkedin
-                    )
-                )
-
-            if df.empty:
-                st.error("No jobs found. The scrapers might be blocked or returned no results.")
-            else:
-                st.session_state.scraped_data_private = df
-                st.session_state.scrape_counts = counts
-                st.session_state.page = "results_private"
-                st.rerun()
+            job_id = enqueue_scrape_job(get_conn(), "private", private_params)
+            set_active_job("private", job_id)
+
+    poll_scrape_job("private")
+    finished_job = take_finished_job("private")
+    if finished_job:
+        df = pd.DataFrame(finished_job["result"]["jobs"])
+        if df.empty:
+            st.error("No jobs found. The scrapers might be blocked or returned no results.")
+        else:
+            st.session_state.scraped_data_private = df
+            st.session_state.scrape_counts = finished_job["result"]["counts"]
+            st.session_state.scrape_trace = finished_job["result"].get("trace")
+            st.session_state.page = "results_private"
+            st.rerun()
 
     if st.session_state.page == "results_private":
         show_private_results_page(keyword)
@@ -765,8 +909,12 @@ if portal_mode == "Private / Corporate":
 
 else:
     if "scrape_btn_govt" in locals() and scrape_btn_govt:
-        with st.spinner("Fetching latest government circulars..."):
-            df_govt = asyncio.run(run_govt_scrape(g_limit, govt_location))
-        st.session_state.govt_data = df_govt
+        job_id = enqueue_scrape_job(get_conn(), "govt", govt_params)
+        set_active_job("govt", job_id)
+
+    poll_scrape_job("govt")
+    finished_job = take_finished_job("govt")
+    if finished_job:
+        st.session_state.govt_data = pd.DataFrame(finished_job["result"]["jobs"])
 
     show_govt_page()
\ No newline at end of file
@@ -2,7 +2,8 @@ import pandas as pd
 import spacy
 from spacy.matcher import PhraseMatcher
 from collections import Counter
-import re
+
+from src.normalize import ALL_KNOWN_SKILLS
 
 try:
     nlp = spacy.load("en_core_web_sm")
@@ -12,36 +13,17 @@ except OSError:
     download("en_core_web_sm")
     nlp = spacy.load("en_core_web_sm")
 
-ALL_KNOWN_SKILLS = [
-    
-    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Swift", "Kotlin", "PHP", "Ruby", "SQL", "R", "Matlab",
-    
-    "React", "Angular", "Vue", "Next.js", "Node.js", "Django", "Flask", "Spring Boot", "ASP.NET", "Laravel", "HTML", "CSS", "Redux", "jQuery", "Bootstrap", "Tailwind",
-   
-    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Keras", "OpenCV", "NLP", "LLM", "Generative AI", "Hugging Face",
-   
-    "AWS", "Azure", "Google Cloud", "GCP", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible", "Linux", "Git", "CI/CD", "GitHub", "GitLab",
-    
-    "Unity", "Unreal Engine", "Godot", "OpenGL", "DirectX", "Shaders", "Blender", "Maya", "3D Math", "Physics", "C#", "Lua",
-   
-    "PostgreSQL", "MongoDB", "MySQL", "Redis", "Elasticsearch", "Oracle", "DynamoDB", "Firebase",
-    
-    "Agile", "Scrum", "JIRA", "Rest API", "GraphQL", "Microservices"
-]
-
 
 matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
 patterns = [nlp.make_doc(text) for text in ALL_KNOWN_SKILLS]
 matcher.add("TECH_SKILL", patterns)
 
-def extract_skills(df):
+def count_skills(df, skill_counter=None):
     """
-    Uses NLP to find skills in Title (and Description if available).
+    Adds the number of jobs in `df` mentioning each skill to `skill_counter`
+    (a new Counter by default), so large histories can be counted in chunks.
     """
-    if df.empty:
-        return pd.DataFrame(columns=['Skill', 'Count'])
-
-    skill_counter = Counter()
+    skill_counter = Counter() if skill_counter is None else skill_counter
 
     for index, row in df.iterrows():
         title_text = str(row.get('Title', ''))
@@ -59,12 +41,22 @@ def extract_skills(df):
             
         skill_counter.update(found_in_this_job)
 
+    return skill_counter
+
+
+def top_skills(skill_counter, n=20):
     if not skill_counter:
         return pd.DataFrame(columns=['Skill', 'Count'])
         
     skills_df = pd.DataFrame(skill_counter.items(), columns=['Skill', 'Count'])
-    return skills_df.sort_values(by='Count', ascending=False).head(20)
+    return skills_df.sort_values(by='Count', ascending=False).head(n)
+
+
+def extract_skills(df):
+    """
+    Uses NLP to find skills in Title (and Description if available).
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['Skill', 'Count'])
 
-def clean_location(location_text):
-    if not isinstance(location_text, str): return "Unknown"
-    return location_text.split(",")[0].strip()
\ No newline at end of file
+    return top_skills(count_skills(df))
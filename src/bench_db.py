@@ -0,0 +1,118 @@
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+
+from src.database import connect, create_schema, insert_jobs
+from src.tracing import percentile
+
+READ_QUERIES = (
+    "SELECT site, COUNT(*) FROM jobs GROUP BY site",
+    "SELECT title, company, location FROM jobs ORDER BY id DESC LIMIT 50",
+)
+
+# "default" is how the app used to connect: plain sqlite3.connect with a
+# rollback journal and synchronous=FULL. "tuned" is database.connect.
+MODES = {
+    "default": lambda path: sqlite3.connect(path),
+    "tuned": lambda path: connect(path),
+}
+
+
+def fake_jobs(n, offset=0):
+    for i in range(offset, offset + n):
+        yield {
+            "title": f"Data Engineer {i}",
+            "company": f"Company {i % 500}",
+            "location": ("Bengaluru", "Pune", "Remote")[i % 3],
+            "description": "python sql spark " * 20,
+            "job_url": f"https://example.com/jobs/{i}",
+            "site": ("Indeed", "Naukri", "LinkedIn")[i % 3],
+            "date_posted": "2024-01-01",
+        }
+
+
+def bench_mode(mode, rows=20000, batch=200):
+    """
+    Ingests `rows` jobs in `batch`-sized commits on one thread while another
+    thread keeps running dashboard reads. Returns ingest throughput and the
+    read latency distribution seen during the ingest.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        open_conn = MODES[mode]
+
+        setup = open_conn(path)
+        create_schema(setup)
+        setup.close()
+
+        done = threading.Event()
+        write = {"errors": 0, "seconds": 0.0}
+
+        def writer():
+            conn = open_conn(path)
+            start = time.perf_counter()
+            try:
+                for offset in range(0, rows, batch):
+                    try:
+                        insert_jobs(conn, fake_jobs(min(batch, rows - offset), offset))
+                    except sqlite3.OperationalError:
+                        write["errors"] += 1
+            finally:
+                write["seconds"] = time.perf_counter() - start
+                conn.close()
+                done.set()
+
+        latencies = []
+        read_errors = 0
+        reader = open_conn(path)
+        thread = threading.Thread(target=writer)
+        thread.start()
+
+        while not done.is_set():
+            for query in READ_QUERIES:
+                start = time.perf_counter()
+                try:
+                    reader.execute(query).fetchall()
+                    latencies.append(time.perf_counter() - start)
+                except sqlite3.OperationalError:
+                    read_errors += 1
+
+        thread.join()
+        reader.close()
+
+    return {
+        "rows": rows,
+        "ingest_s": round(write["seconds"], 3),
+        "rows_per_sec": round(rows / write["seconds"]) if write["seconds"] else 0,
+        "write_errors": write["errors"],
+        "reads": len(latencies),
+        "read_errors": read_errors,
+        "read_p50_ms": round(1000 * (percentile(latencies, 0.5) or 0), 3),
+        "read_p95_ms": round(1000 * (percentile(latencies, 0.95) or 0), 3),
+        "read_max_ms": round(1000 * max(latencies, default=0), 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark read latency during a bulk ingest, default vs. tuned connections."
+    )
+    parser.add_argument("modes", nargs="*", default=list(MODES))
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=200)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        res = bench_mode(mode, args.rows, args.batch)
+        print(
+            f"{mode}: ingested {res['rows']} rows in {res['ingest_s']}s "
+            f"({res['rows_per_sec']} rows/s, {res['write_errors']} failed batches)"
+        )
+        print(
+            f"    {res['reads']} reads during ingest: p50 {res['read_p50_ms']} ms, "
+            f"p95 {res['read_p95_ms']} ms, max {res['read_max_ms']} ms, "
+            f"{res['read_errors']} errors"
+        )
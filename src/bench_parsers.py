@@ -0,0 +1,116 @@
+import sys
+import json
+import time
+import argparse
+
+from src.card_parser import SITE_SPECS, parse_cards, extract_fields_soup
+from src.replay import FIXTURES_VERSION, load_pages
+
+
+def bench_site(site, repeat=5, version=FIXTURES_VERSION):
+    """
+    Times snapshot parsing of every recorded page for a site. Returns
+    cards/sec for the full parse (document parse + all fields) and the
+    average cost of each field in microseconds per card.
+    """
+    spec = SITE_SPECS[site]
+    pages = load_pages(site, version)
+    if not pages:
+        return None
+
+    n_cards = 0
+    parse_time = 0.0
+    extract_time = 0.0
+    field_time = {name: 0.0 for name in spec["fields"]}
+
+    for _ in range(repeat):
+        for html, url in pages:
+            start = time.perf_counter()
+            cards = parse_cards(html, spec)
+            parse_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for card in cards:
+                try:
+                    extract_fields_soup(card, spec, url)
+                except ValueError:
+                    pass
+            extract_time += time.perf_counter() - start
+
+            for name in field_time:
+                start = time.perf_counter()
+                for card in cards:
+                    try:
+                        extract_fields_soup(card, spec, url, only=(name,))
+                    except ValueError:
+                        pass
+                field_time[name] += time.perf_counter() - start
+
+            n_cards += len(cards)
+
+    total = parse_time + extract_time
+    return {
+        "pages": len(pages),
+        "cards": n_cards // repeat,
+        "cards_per_sec": round(n_cards / total, 1) if total else 0.0,
+        "parse_ms_per_page": round(1000 * parse_time / (repeat * len(pages)), 3),
+        "field_us_per_card": {
+            name: round(1e6 * t / n_cards, 2) if n_cards else 0.0
+            for name, t in field_time.items()
+        },
+    }
+
+
+def check_regressions(results, baseline, tolerance):
+    failures = []
+    for site, res in results.items():
+        base = baseline.get(site)
+        if not res or not base:
+            continue
+        floor = base["cards_per_sec"] * (1 - tolerance)
+        if res["cards_per_sec"] < floor:
+            failures.append(
+                f"{site}: {res['cards_per_sec']} cards/s < {floor:.1f} "
+                f"(baseline {base['cards_per_sec']})"
+            )
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark card parsing on recorded pages.")
+    parser.add_argument("sites", nargs="*", default=list(SITE_SPECS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--version", default=FIXTURES_VERSION)
+    parser.add_argument("--baseline", help="JSON file of earlier results to compare against")
+    parser.add_argument("--save-baseline", help="write these results to a JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed cards/sec drop vs. baseline (fraction)")
+    args = parser.parse_args()
+
+    results = {}
+    for site in args.sites:
+        res = bench_site(site, args.repeat, args.version)
+        results[site] = res
+
+        if res is None:
+            print(f"{site}: no recorded pages (scrape it with \"Record pages for parser benchmarks\" ticked first)")
+            continue
+
+        print(
+            f"{site}: {res['cards']} cards / {res['pages']} pages, "
+            f"{res['cards_per_sec']} cards/s, {res['parse_ms_per_page']} ms/page to parse"
+        )
+        for name, us in res["field_us_per_card"].items():
+            print(f"    {name:<12} {us:>8} us/card")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = check_regressions(results, json.load(f), args.tolerance)
+        for msg in failures:
+            print(f"REGRESSION {msg}")
+        if failures:
+            sys.exit(1)
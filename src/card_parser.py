@@ -0,0 +1,171 @@
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+# Per-site selector specs shared by the snapshot (BeautifulSoup) and live
+# element (WebDriver) extraction paths. A field is read from the first match
+# of `css` (or the card itself when `css` is None); `attr` reads an attribute
+# instead of text (falling back to the element text when `fallback_text` is
+# set and the attribute is empty), `all` returns the text of every match, and
+# fields without a `default` are required.
+SITE_SPECS = {
+    "Indeed": {
+        "card": "div.job_seen_beacon",
+        "fields": {
+            "title": {"css": "h2 span"},
+            "company": {"css": "span[data-testid='company-name']"},
+            "location": {"css": "div[data-testid='text-location']"},
+            "metadata": {"css": ".metadata", "all": True},
+            "date_text": {"css": "span.date", "default": "Today"},
+            "link": {"css": "a", "attr": "href", "default": "#"},
+        },
+    },
+    "Naukri": {
+        "card": ".srp-jobtuple-wrapper",
+        "fields": {
+            "title": {"css": ".title"},
+            "company": {"css": ".comp-name"},
+            "location": {"css": ".locWdth"},
+            "experience": {"css": ".expwdth", "default": "N/A"},
+            "salary": {"css": ".sal-wrap", "default": "Not Disclosed"},
+            "date_text": {"css": ".job-post-day", "default": "Today"},
+            "link": {"css": ".title", "attr": "href", "default": "#"},
+        },
+    },
+    "LinkedIn": {
+        "card": ".base-search-card",
+        "fields": {
+            "title": {"css": ".base-search-card__title", "default": "N/A"},
+            "company": {"css": ".base-search-card__subtitle", "default": "N/A"},
+            "location": {"css": ".job-search-card__location", "default": "N/A"},
+            "link": {"css": ".base-card__full-link", "attr": "href", "default": "#"},
+            "date_text": {
+                "css": "time",
+                "attr": "datetime",
+                "fallback_text": True,
+                "default": "Today",
+            },
+        },
+    },
+    "JobKaka": {
+        "card": "a.content_link",
+        "fields": {
+            "title": {"css": ".entry-title"},
+            "details": {"css": ".entry-job-date-details", "all": True},
+            "link": {"css": None, "attr": "href"},
+        },
+    },
+}
+
+
+def _tag_text(tag):
+    return tag.get_text(" ", strip=True)
+
+
+def extract_fields_soup(card, spec, base_url=None, only=None):
+    fields = {}
+
+    for name, field in spec["fields"].items():
+        if only is not None and name not in only:
+            continue
+
+        css = field.get("css")
+
+        if field.get("all"):
+            matches = card.select(css) if css else [card]
+            fields[name] = [_tag_text(m) for m in matches]
+            continue
+
+        el = card.select_one(css) if css else card
+        value = None
+
+        if el is not None:
+            if field.get("attr"):
+                value = el.get(field["attr"])
+                if value and field["attr"] == "href" and base_url:
+                    value = urljoin(base_url, value)
+                if not value and field.get("fallback_text"):
+                    value = _tag_text(el)
+            else:
+                value = _tag_text(el)
+
+        if value is None:
+            if "default" not in field:
+                raise ValueError(f"Missing required field '{name}'")
+            value = field["default"]
+
+        fields[name] = value
+
+    return fields
+
+
+# Evaluated inside the page by Playwright: extracts the raw fields of every
+# card from index `start` onwards in a single round trip, using the same spec.
+# Missing values come back as null and defaults are applied in Python.
+BATCH_EXTRACT_JS = """
+([cardSelector, fields, start]) => {
+    const text = (el) => (el.innerText || el.textContent || "").trim();
+    const cards = Array.from(document.querySelectorAll(cardSelector)).slice(start);
+
+    return cards.map((card) => {
+        const out = {};
+        for (const [name, f] of Object.entries(fields)) {
+            if (f.all) {
+                const els = f.css ? Array.from(card.querySelectorAll(f.css)) : [card];
+                out[name] = els.map(text);
+                continue;
+            }
+
+            const el = f.css ? card.querySelector(f.css) : card;
+            let value = null;
+            if (el) {
+                if (f.attr) {
+                    value = f.attr === "href" && el.href ? el.href : el.getAttribute(f.attr);
+                    if (!value && f.fallback_text) value = text(el);
+                } else {
+                    value = text(el);
+                }
+            }
+            out[name] = value;
+        }
+        return out;
+    });
+}
+"""
+
+
+def apply_defaults(raw, spec):
+    fields = {}
+    for name, field in spec["fields"].items():
+        value = raw.get(name)
+        if value is None:
+            if "default" not in field:
+                raise ValueError(f"Missing required field '{name}'")
+            value = field["default"]
+        fields[name] = value
+    return fields
+
+
+def parse_cards(html, spec):
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return soup.select(spec["card"])
+
+
+def parse_page(html, spec, base_url=None):
+    """
+    Parses every card on a page snapshot offline. Cards missing a required
+    field are skipped.
+    """
+    results = []
+    for card in parse_cards(html, spec):
+        try:
+            results.append(extract_fields_soup(card, spec, base_url))
+        except ValueError:
+            pass
+    return results
@@ -0,0 +1,75 @@
+import json
+import sqlite3
+
+from src.database import init_db
+
+# Listings move quickly; an older checkpoint would resume into a different
+# result set, so it is discarded and the scrape starts over.
+CHECKPOINT_MAX_AGE_HOURS = 12
+
+
+def checkpoint_key(site, filters):
+    return f"{site}:{json.dumps(filters, sort_keys=True)}"
+
+
+class ScrapeCheckpoint:
+    """
+    Page cursor and jobs collected so far for one site + filter combination,
+    saved after every completed page. A failed or interrupted scrape leaves
+    its checkpoint behind so the next run with the same filters resumes from
+    the last completed page; a scrape that runs to completion clears it.
+    """
+
+    def __init__(self, site, filters, conn=None):
+        self.site = site
+        self.filters = filters
+        self.key = checkpoint_key(site, filters)
+        self._own_conn = conn is None
+        self.conn = conn or init_db()
+
+    def load(self, first_page):
+        """
+        Returns (next_page, jobs), or (first_page, []) when there is nothing
+        recent to resume from.
+        """
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM scrape_checkpoints WHERE updated_at < datetime('now', ?)",
+                (f"-{CHECKPOINT_MAX_AGE_HOURS} hours",),
+            )
+
+        row = self.conn.execute(
+            "SELECT next_page, jobs FROM scrape_checkpoints WHERE key = ?", (self.key,)
+        ).fetchone()
+        if row is None:
+            return first_page, []
+
+        next_page, jobs = row[0], json.loads(row[1])
+        print(f"[{self.site}] Resuming with {len(jobs)} jobs (page cursor {next_page})")
+        return next_page, jobs
+
+    def save(self, next_page, jobs):
+        try:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    INSERT INTO scrape_checkpoints (key, site, filters, next_page, jobs, updated_at)
+                    VALUES (?, ?, ?, ?, ?, datetime('now'))
+                    ON CONFLICT(key) DO UPDATE SET
+                        next_page = excluded.next_page,
+                        jobs = excluded.jobs,
+                        updated_at = excluded.updated_at
+                    """,
+                    (self.key, self.site, json.dumps(self.filters), next_page, json.dumps(jobs)),
+                )
+        except sqlite3.Error as e:
+            print(f"[{self.site}] Could not save checkpoint: {e}")
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM scrape_checkpoints WHERE key = ?", (self.key,))
+
+    def close(self):
+        if self._own_conn:
+            self.conn.close()
+
@@ -0,0 +1,98 @@
+import io
+import os
+import csv
+import gzip
+
+DEFAULT_BUFFER_ROWS = 500
+
+
+def _open_zstd(path, mode):
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("Writing .zst files needs the 'zstandard' package") from None
+
+    raw = open(path, mode + "b")
+    # Appending adds a new zstd frame; concatenated frames decode as one stream.
+    writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+
+
+def open_text(path, mode="a"):
+    """
+    Opens `path` for writing text, compressed according to its extension
+    (.gz or .zst). Mode "a" appends, "w" truncates.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    if path.endswith(".zst"):
+        return _open_zstd(path, mode)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+class CsvSink:
+    """
+    Buffered CSV writer over one open file handle. Job dicts (or plain row
+    tuples) are collected and written `buffer_size` rows at a time; keys
+    outside `columns` are dropped. The header is only written to a new or
+    empty file.
+    """
+
+    def __init__(self, path, columns, mode="a", buffer_size=DEFAULT_BUFFER_ROWS):
+        self.path = path
+        self.columns = list(columns)
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.rows_written = 0
+
+        self._buffer = []
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        new_file = (
+            self.mode == "w"
+            or not os.path.exists(self.path)
+            or os.path.getsize(self.path) == 0
+        )
+        self._file = open_text(self.path, self.mode)
+        self._writer = csv.writer(self._file)
+        if new_file:
+            self._writer.writerow(self.columns)
+        return self
+
+    def write(self, jobs):
+        self.write_rows(
+            [job.get(col) for col in self.columns] for job in jobs
+        )
+
+    def write_rows(self, rows):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
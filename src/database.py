@@ -1,16 +1,80 @@
+import re
 import sqlite3
 import os
+import threading
 import pandas as pd
 
+from src.csv_sink import CsvSink
+from src.dedup import assign_clusters, assign_cluster_rows, refresh_descriptions
+from src.normalize import DERIVED_COLUMNS, derive_columns
+from src.rollups import (
+    create_rollup_tables, rebuild_rollups, update_rollups, update_description_skills, apply_rollups,
+)
+
 DATA_DIR = "data"
 DB_PATH = os.path.join(DATA_DIR, "jobs.db")
 CSV_PATH = os.path.join(DATA_DIR, "all_jobs.csv")
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
+BUSY_TIMEOUT_MS = 10000
+
+# WAL lets dashboard reads run while a scrape is writing; NORMAL sync is
+# durable across app crashes in WAL mode and avoids an fsync per commit.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", BUSY_TIMEOUT_MS),
+    ("cache_size", -32000),  # in KiB, ~32 MB
+    ("mmap_size", 256 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+    # Lets retention.py return pages freed by archiving with
+    # incremental_vacuum. New databases get it at creation; existing ones
+    # switch over on their next full VACUUM.
+    ("auto_vacuum", "INCREMENTAL"),
+)
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+_local = threading.local()
+
+
+def connect(path=DB_PATH, pragmas=SQLITE_PRAGMAS):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+    for name, value in pragmas:
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def init_db(path=DB_PATH):
+    """
+    Opens a new tuned connection, creating the schema the first time the
+    process touches the database. The caller owns (and closes) it.
+    """
+    conn = connect(path)
+    with _schema_lock:
+        if path not in _schema_ready:
+            create_schema(conn)
+            _schema_ready.add(path)
+    return conn
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
+
+def get_conn(path=DB_PATH):
+    """
+    Returns this thread's shared connection, opening it on first use. Meant
+    for short reads and writes from the app; don't close it.
+    """
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.conns = {}
+
+    conn = _local.conns.get(path)
+    if conn is None:
+        conn = _local.conns[path] = init_db(path)
+    return conn
+
+
+def create_schema(conn):
     with conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS jobs (
@@ -26,57 +90,655 @@ def init_db():
                 date_posted TEXT
             )
         """)
-    return conn
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                progress INTEGER NOT NULL DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT (datetime('now')),
+                started_at TEXT,
+                finished_at TEXT,
+                heartbeat_at TEXT
+            )
+        """)
+        add_missing_columns(conn, "scrape_jobs", {
+            "schedule_id": "INTEGER",
+            "row_count": "INTEGER",
+        })
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs (status, id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scrape_jobs_schedule ON scrape_jobs (schedule_id, id)"
+        )
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_schedules (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                cron TEXT NOT NULL,
+                jitter_seconds INTEGER NOT NULL DEFAULT 300,
+                enabled INTEGER NOT NULL DEFAULT 1,
+                next_run_at TEXT,
+                last_job_id INTEGER,
+                created_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+                key TEXT PRIMARY KEY,
+                site TEXT NOT NULL,
+                filters TEXT NOT NULL,
+                next_page INTEGER NOT NULL,
+                jobs TEXT NOT NULL,
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+    migrate(conn)
+    backfill_clusters(conn)
 
 
-def insert_job(conn, job):
+JOB_INDEXES = {
+    "idx_jobs_site_date": "jobs (site, date_iso)",
+    "idx_jobs_date_posted": "jobs (date_posted)",
+    "idx_jobs_company": "jobs (company)",
+    "idx_jobs_location": "jobs (location_clean)",
+    "idx_jobs_site_exp": "jobs (site, exp_bucket)",
+}
+
+
+def _migrate_derived_columns(conn, chunk_size=1000):
+    """
+    Adds the normalized columns, backfills them for existing rows and
+    indexes the columns the dashboards filter and group on.
+    """
+    add_missing_columns(conn, "jobs", DERIVED_COLUMNS)
+
+    assignments = ", ".join(f"{name} = ?" for name in DERIVED_COLUMNS)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, location, salary, experience, date_posted FROM jobs
+            WHERE id > ? ORDER BY id LIMIT ?
+            """,
+            (last_id, chunk_size),
+        ).fetchall()
+        if not rows:
+            break
+
+        conn.executemany(
+            f"UPDATE jobs SET {assignments} WHERE id = ?",
+            [
+                (*derive_columns({
+                    "location": location, "salary": salary,
+                    "experience": experience, "date_posted": date_posted,
+                }).values(), job_id)
+                for job_id, location, salary, experience, date_posted in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+    for name, target in JOB_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+FTS_COLUMNS = ("title", "company", "location", "description")
+
+
+def _migrate_fts(conn):
+    """
+    Adds jobs_fts, an FTS5 index over the job text that reads its content
+    from the jobs table. Triggers keep it in step with every insert, update
+    and delete, so the ingest and enrichment paths need no changes.
+    """
+    columns = ", ".join(FTS_COLUMNS)
+    new_columns = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_columns = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            {columns}, content='jobs', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, {columns}) VALUES (new.id, {new_columns});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_columns});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF {columns} ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_columns});
+            INSERT INTO jobs_fts (rowid, {columns}) VALUES (new.id, {new_columns});
+        END
+    """)
+    conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
+def _migrate_listing_index(conn):
+    # Lets the analytics export find a job's first listing by (title, company).
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_title_company ON jobs (title, company)")
+
+
+def _migrate_clusters(conn):
+    """
+    Adds near-duplicate clustering: jobs.cluster_id and the MinHash
+    signatures and LSH buckets behind it (see dedup.py). Existing rows are
+    clustered afterwards by backfill_clusters, outside this transaction.
+    Cluster ids replace the (title, company) first-listing check.
+    """
+    add_missing_columns(conn, "jobs", {"cluster_id": "INTEGER"})
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_cluster ON jobs (cluster_id)")
+    conn.execute("DROP INDEX IF EXISTS idx_jobs_title_company")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_minhash (
+            job_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL,
+            description_signature BLOB
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_rollups(conn):
+    # Dashboard counts kept up to date by insert_jobs (see rollups.py).
+    create_rollup_tables(conn)
+    rebuild_rollups(conn)
+
+
+def _drop_analytics_exports(conn):
+    # Bookkeeping of the removed Parquet analytics export.
+    conn.execute("DROP TABLE IF EXISTS analytics_exports")
+
+
+# Applied in order; PRAGMA user_version records how many have run.
+MIGRATIONS = [
+    _migrate_derived_columns,
+    _migrate_fts,
+    _migrate_listing_index,
+    _migrate_clusters,
+    _migrate_rollups,
+    # Site totals now count every posting, not one per cluster.
+    rebuild_rollups,
+    _drop_analytics_exports,
+]
+
+
+def migrate(conn):
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+
+    # Take the write lock before re-reading the version so two processes
+    # starting together don't both apply the same step.
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        with conn:
-            conn.execute("""
-                INSERT OR IGNORE INTO jobs
-                (title, company, location, salary, experience, description, job_url, site, date_posted)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                job.get("title"),
-                job.get("company"),
-                job.get("location"),
-                job.get("salary", "Not Disclosed"),
-                job.get("experience", "N/A"),
-                job.get("description", "N/A"),
-                job.get("job_url"),
-                job.get("site"),
-                job.get("date_posted")
-            ))
-    except sqlite3.Error:
-        pass
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, step in enumerate(MIGRATIONS[version:], start=version + 1):
+            print(f"[DB] Migrating schema to version {target}")
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+
+
+CLUSTER_BACKFILL_ROWS = 2000
+
+
+def backfill_clusters(conn, chunk_size=CLUSTER_BACKFILL_ROWS):
+    """
+    Clusters jobs stored before near-duplicate detection existed, oldest
+    first, committing every `chunk_size` rows so other writers only wait
+    for one chunk. Jobs that start a cluster are added to the per-cluster
+    rollups (the site totals already count them). Returns the number of
+    jobs clustered.
+    """
+    if conn.execute("SELECT 1 FROM jobs WHERE cluster_id IS NULL LIMIT 1").fetchone() is None:
+        return 0
+
+    total = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                SELECT id, title, company, location, location_clean, description FROM jobs
+                WHERE cluster_id IS NULL ORDER BY id LIMIT ?
+                """,
+                (chunk_size,),
+            ).fetchall()
+            if not rows:
+                conn.rollback()
+                break
+
+            ids = [row[0] for row in rows]
+            assign_cluster_rows(conn, rows)
+            apply_rollups(conn, f"id IN ({','.join('?' * len(ids))})", ids, sites=False)
+            conn.commit()
+
+        except Exception:
+            conn.rollback()
+            raise
+
+        total += len(rows)
+
+    if total:
+        print(f"[DB] Clustered {total} existing jobs")
+    return total
+
+
+def add_missing_columns(conn, table, columns):
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, col_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+
+
+# Raw scraped fields, in the order they are written to CSV.
+CSV_COLUMNS = (
+    "title", "company", "location", "salary", "experience",
+    "description", "job_url", "site", "date_posted",
+)
+
+JOB_COLUMNS = (*CSV_COLUMNS, *DERIVED_COLUMNS)
 
+INSERT_JOB_SQL = f"""
+    INSERT OR IGNORE INTO jobs ({", ".join(JOB_COLUMNS)})
+    VALUES ({", ".join("?" * len(JOB_COLUMNS))})
+"""
 
-def export_to_csv(output_path="data/all_jobs.csv"):
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+INSERT_BATCH_SIZE = 500
+
+
+def job_row(job):
+    return (
+        job.get("title"),
+        job.get("company"),
+        job.get("location"),
+        job.get("salary", "Not Disclosed"),
+        job.get("experience", "N/A"),
+        job.get("description", "N/A"),
+        job.get("job_url"),
+        job.get("site"),
+        job.get("date_posted"),
+        *derive_columns(job).values(),
+    )
+
+
+def _stored_urls(conn, urls):
+    urls = [u for u in urls if u is not None]
+    if not urls:
+        return set()
+    return {
+        url for (url,) in conn.execute(
+            f"SELECT job_url FROM jobs WHERE job_url IN ({','.join('?' * len(urls))})", urls
+        )
+    }
+
+
+def _insert_batch(conn, batch, failed):
+    """
+    Inserts one batch with executemany under a savepoint. If any row makes
+    SQLite reject the batch, it is rolled back and retried row by row so
+    only the bad rows are skipped and reported. Returns the positions of
+    the rows that were actually inserted (not already stored).
+    """
+    stored = _stored_urls(conn, [row[6] for row in batch])
+    rejected = set()
+
+    conn.execute("SAVEPOINT insert_batch")
     try:
-        df = pd.read_sql_query("SELECT * FROM jobs", conn)
-        df.to_csv(output_path, index=False)
-        return df
+        conn.executemany(INSERT_JOB_SQL, batch)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO insert_batch")
+        for i, row in enumerate(batch):
+            try:
+                conn.execute(INSERT_JOB_SQL, row)
+            except sqlite3.Error as e:
+                rejected.add(i)
+                failed.append({"job_url": row[6], "error": str(e)})
     finally:
-        conn.close()
+        conn.execute("RELEASE insert_batch")
+
+    inserted = []
+    for i, row in enumerate(batch):
+        url = row[6]
+        if i in rejected or url in stored:
+            continue
+        if url is not None:
+            stored.add(url)
+        inserted.append(i)
+    return inserted
+
+
+def insert_jobs(conn, jobs, batch_size=INSERT_BATCH_SIZE):
+    """
+    Inserts jobs in a single transaction, `batch_size` rows per executemany,
+    assigns the new rows their near-duplicate cluster_id and adds them to
+    the dashboard rollups. Jobs whose URL
+    is already stored are ignored. Returns a dict with the
+    number of rows inserted and ignored, the `new` job dicts that were
+    inserted, and a `failed` list of {"job_url", "error"} for rows that
+    could not be written.
+    """
+    result = {"inserted": 0, "ignored": 0, "new": [], "failed": []}
+
+    valid, rows = [], []
+    for job in jobs:
+        try:
+            rows.append(job_row(job))
+            valid.append(job)
+        except (AttributeError, TypeError) as e:
+            result["failed"].append({"job_url": None, "error": f"Malformed job: {e}"})
+
+    if not rows:
+        return result
+
+    malformed = len(result["failed"])
+    own_tx = not conn.in_transaction
+
+    try:
+        if own_tx:
+            # IMMEDIATE so no other writer can add rows between reading the
+            # last id and inserting; update_rollups relies on it.
+            conn.execute("BEGIN IMMEDIATE")
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()[0]
+        for i in range(0, len(rows), batch_size):
+            for j in _insert_batch(conn, rows[i:i + batch_size], result["failed"]):
+                result["new"].append(valid[i + j])
+        assign_clusters(conn, last_id)
+        update_rollups(conn, last_id)
+        if own_tx:
+            conn.commit()
+
+    except sqlite3.Error:
+        if own_tx:
+            conn.rollback()
+        raise
+
+    # Not conn.total_changes, which also counts rows written by triggers.
+    result["inserted"] = len(result["new"])
+    result["ignored"] = len(rows) - result["inserted"] - (len(result["failed"]) - malformed)
+    return result
+
+
+def insert_job(conn, job):
+    return insert_jobs(conn, [job])
+
+
+def attach_cluster_ids(conn, jobs, chunk_size=500):
+    """
+    Sets job["cluster_id"] on scraped job dicts from their stored rows,
+    matched by job_url, so fresh results can be de-duplicated the same way.
+    """
+    by_url = {job["job_url"]: job for job in jobs if job.get("job_url")}
+    urls = list(by_url)
+    for i in range(0, len(urls), chunk_size):
+        chunk = urls[i:i + chunk_size]
+        for url, cluster_id in conn.execute(
+            f"SELECT job_url, cluster_id FROM jobs WHERE job_url IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ):
+            by_url[url]["cluster_id"] = cluster_id
+
+
+def load_job_urls(conn, after_id=0):
+    """
+    Yields (id, job_url) for stored jobs with id > `after_id`, oldest first.
+    """
+    yield from conn.execute(
+        "SELECT id, job_url FROM jobs WHERE id > ? AND job_url IS NOT NULL ORDER BY id",
+        (after_id,),
+    )
+
+
+# Scrapers only see listing cards, so until enrichment the description is a
+# placeholder built from the card itself.
+PLACEHOLDER_DESCRIPTION_SQL = """
+    (description IS NULL OR description IN ('', 'N/A')
+     OR description = title
+     OR description = title || ' ' || company || ' ' || location)
+"""
+
+
+def load_jobs_needing_description(conn, urls=None, limit=None, chunk_size=500):
+    query = f"SELECT job_url, site FROM jobs WHERE {PLACEHOLDER_DESCRIPTION_SQL}"
+
+    if urls is None:
+        query += " ORDER BY id DESC"
+        if limit:
+            return conn.execute(query + " LIMIT ?", (limit,)).fetchall()
+        return conn.execute(query).fetchall()
+
+    urls = list(urls)
+    rows = []
+    for i in range(0, len(urls), chunk_size):
+        chunk = urls[i:i + chunk_size]
+        rows.extend(conn.execute(
+            query + f" AND job_url IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall())
+
+    return rows[:limit] if limit else rows
+
+
+def _job_ids(conn, urls, chunk_size=500):
+    urls = list(urls)
+    ids = []
+    for i in range(0, len(urls), chunk_size):
+        chunk = urls[i:i + chunk_size]
+        ids.extend(row[0] for row in conn.execute(
+            f"SELECT id FROM jobs WHERE job_url IN ({','.join('?' * len(chunk))})", chunk
+        ))
+    return ids
+
+
+def update_descriptions(conn, descriptions):
+    try:
+        with conn:
+            # Take the write lock first so the skill rollups move from the
+            # descriptions this UPDATE actually replaces.
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            update_description_skills(conn, descriptions)
+            conn.executemany(
+                "UPDATE jobs SET description = ? WHERE job_url = ?",
+                [(desc, url) for url, desc in descriptions.items()],
+            )
+            # Real descriptions can split postings that were clustered on
+            # their listing alone; jobs that start a new cluster get counted.
+            new_clusters = refresh_descriptions(conn, _job_ids(conn, descriptions))
+            if new_clusters:
+                apply_rollups(
+                    conn, f"id IN ({','.join('?' * len(new_clusters))})", new_clusters, sites=False
+                )
+    except sqlite3.Error as e:
+        print(f"[DB] Error updating descriptions: {e}")
+
+
+def export_to_csv(output_path=CSV_PATH, chunk_size=5000, filters=None):
+    """
+    Streams the jobs matching `filters` (see query_jobs) to `output_path`
+    (gzip/zstd by extension) in chunks of `chunk_size` rows, so memory stays
+    flat however large the table is. Returns the number of rows written.
+    """
+    sql, params = jobs_select_sql(CSV_COLUMNS, filters)
+    cursor = get_conn().execute(sql, params)
+    with CsvSink(output_path, CSV_COLUMNS, mode="w", buffer_size=chunk_size) as sink:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            sink.write_rows(rows)
+    return sink.rows_written
 
 
 def save_to_csv(job):
-    df_job = pd.DataFrame([job])
+    with CsvSink(CSV_PATH, CSV_COLUMNS) as sink:
+        sink.write([job])
 
-    if not os.path.exists(CSV_PATH):
-        df_job.to_csv(CSV_PATH, index=False)
-        return
 
-    df_job.to_csv(CSV_PATH, mode="a", header=False, index=False)
+# Columns query_jobs can return.
+QUERY_COLUMNS = ("id", *JOB_COLUMNS, "cluster_id")
+
+# Columns query_jobs and search_jobs can filter on; they are interpolated
+# into SQL.
+FILTER_COLUMNS = ("site", "company", "location", "location_clean", "exp_bucket", "salary_period")
+
+
+def filter_sql(filters, prefix=""):
+    """
+    WHERE terms and params for `filters`, which maps FILTER_COLUMNS to a
+    value or list of values. "since" and "until" bound date_iso, inclusive.
+    """
+    where, params = [], []
+    for column, value in (filters or {}).items():
+        if column in ("since", "until"):
+            where.append(f"{prefix}date_iso {'>=' if column == 'since' else '<='} ?")
+            params.append(value)
+            continue
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot filter on '{column}'")
+
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        where.append(f"{prefix}{column} IN ({', '.join('?' * len(values))})")
+        params += values
+    return where, params
+
+
+def jobs_select_sql(columns=None, filters=None, newest_first=False, limit=None):
+    columns = list(columns or QUERY_COLUMNS)
+    unknown = set(columns) - set(QUERY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown job columns: {', '.join(sorted(unknown))}")
+
+    where, params = filter_sql(filters)
+    sql = f"SELECT {', '.join(columns)} FROM jobs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id DESC" if newest_first else " ORDER BY id"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
+
+
+def query_jobs(columns=None, filters=None, chunk_size=None, newest_first=False,
+               limit=None, conn=None):
+    """
+    Reads `columns` (default: all of QUERY_COLUMNS) of the jobs matching
+    `filters`, with the projection and predicates run in SQLite, e.g.
+    query_jobs(["title", "company"], {"site": ["Indeed"], "since": "2024-01-01"}).
+    Returns one DataFrame, or with `chunk_size` an iterator of DataFrames of
+    at most that many rows read lazily from the cursor.
+    """
+    sql, params = jobs_select_sql(columns, filters, newest_first, limit)
+    return pd.read_sql_query(sql, conn or get_conn(), params=params, chunksize=chunk_size)
+
+
+def load_all_jobs(columns=None, filters=None):
+    return query_jobs(columns, filters)
+
+
+def unique_jobs_sql(sites):
+    """
+    SQL for the jobs from `sites`, one row per near-duplicate cluster (its
+    earliest posting).
+    """
+    marks = ", ".join("?" * len(sites))
+    sql = f"SELECT * FROM jobs WHERE site IN ({marks}) AND cluster_id = id"
+    return sql, list(sites)
+
+
+def load_recent_jobs(conn, sites, limit=500):
+    sql, params = unique_jobs_sql(sites)
+    return pd.read_sql_query(
+        f"SELECT * FROM ({sql}) ORDER BY id DESC LIMIT ?", conn, params=params + [limit]
+    )
+
+
+# Per-column bm25 weights, in FTS_COLUMNS order: a hit in the title counts
+# for more than one in the description.
+SEARCH_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+
+# Ranking is limited to the newest matches, so a query that hits most of
+# the table still returns quickly.
+SEARCH_CANDIDATES = 10000
+
+
+def fts_query(text):
+    """
+    Turns free text into an FTS5 query where every word must match. Words
+    are quoted so FTS5 operators and punctuation in the input are harmless;
+    a trailing * (e.g. "kube*") keeps prefix matching.
+    """
+    words = re.findall(r"(\w+)(\*?)", text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"{star}' for word, star in words)
+
+
+def search_jobs(query, filters=None, limit=20, offset=0):
+    """
+    Full-text search over title, company, location and description, best
+    matches first (bm25 among the newest SEARCH_CANDIDATES hits), narrowed
+    by `filters` as in query_jobs. Each result has a `snippet` of the best
+    matching column with hits in [brackets].
+    """
+    match = fts_query(query)
+    if match is None:
+        return pd.DataFrame()
 
+    where, params = filter_sql(filters, prefix="j.")
+    where.insert(0, "jobs_fts MATCH ?")
+    params.insert(0, match)
 
-def load_all_jobs():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM jobs", conn)
-    conn.close()
-    return df
+    matches = f"FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid WHERE {' AND '.join(where)}"
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    return pd.read_sql_query(
+        f"""
+        SELECT j.id, j.title, j.company, j.location, j.site, j.date_posted,
+               j.exp_bucket, j.job_url,
+               snippet(jobs_fts, -1, '[', ']', ' … ', 16) AS snippet,
+               bm25(jobs_fts, {weights}) AS score
+        {matches}
+          AND jobs_fts.rowid >= (
+              SELECT MIN(id) FROM (
+                  SELECT jobs_fts.rowid AS id {matches}
+                  ORDER BY jobs_fts.rowid DESC LIMIT ?
+              )
+          )
+        ORDER BY score
+        LIMIT ? OFFSET ?
+        """,
+        get_conn(),
+        params=params + params + [SEARCH_CANDIDATES, limit, offset],
+    )
 
 
 def load_all_jobs_csv():
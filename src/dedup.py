@@ -0,0 +1,430 @@
+import re
+import zlib
+import hashlib
+
+import numpy as np
+
+NUM_PERM = 96
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+# Estimated Jaccard similarity of the listing features (see
+# listing_features) needed to join an existing cluster. With 16 bands of 6
+# rows, pairs above 0.75 share a bucket at least 96% of the time and pairs
+# below 0.45 rarely do.
+SIMILARITY_THRESHOLD = 0.7
+# When both jobs have a real description, they must also overlap this much,
+# so two different openings with the same title at one company stay apart.
+DESCRIPTION_THRESHOLD = 0.3
+# Bounds the work per new job when a bucket is very common.
+MAX_CANDIDATES = 200
+# Features hashed per numpy pass in minhash_many (~15 MB of uint64s).
+MINHASH_BLOCK_FEATURES = 20000
+
+SHINGLE_WORDS = 3
+MAX_DESCRIPTION_WORDS = 400
+
+# Dropped from company names, so "Acme Technologies Pvt Ltd" == "Acme".
+COMPANY_SUFFIXES = {
+    "pvt", "private", "ltd", "limited", "llp", "inc", "llc", "corp",
+    "corporation", "co", "company", "india", "the", "technologies",
+    "technology", "solutions", "services", "systems", "software", "group",
+}
+
+LOCATION_ALIASES = {
+    "bangalore": "bengaluru",
+    "bombay": "mumbai",
+    "gurgaon": "gurugram",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "new delhi": "delhi",
+    "poona": "pune",
+}
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(699)
+_PERM_A = _rng.randint(1, 1 << 32, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+
+
+def _words(text):
+    return re.findall(r"[a-z0-9+#]+", text.lower()) if isinstance(text, str) else []
+
+
+def listing_features(title, company, location):
+    """
+    The set the listing signature is taken over: title words, word pairs
+    and the whole title, each tied to the normalized company and location.
+    Postings at different companies or cities share no features, so only
+    the title is compared fuzzily, and "Acme Technologies Pvt Ltd" in
+    Bangalore matches "Acme" in Bengaluru. "Senior Data Engineer" and
+    "Data Engineer" score 0.43 and stay apart.
+    """
+    title_words = _words(title)
+    if not title_words:
+        return set()
+
+    company = " ".join(w for w in _words(company) if w not in COMPANY_SUFFIXES)
+    location = " ".join(_words(location))
+    location = LOCATION_ALIASES.get(location, location)
+
+    title_features = {f"t:{w}" for w in title_words}
+    title_features.update(f"tb:{a} {b}" for a, b in zip(title_words, title_words[1:]))
+    title_features.add(f"tf:{' '.join(title_words)}")
+    return {f"{feature}|{company}|{location}" for feature in title_features}
+
+
+def description_shingles(description, title, company, location):
+    """
+    Word shingles of a real description. Card placeholders (empty, "N/A" or
+    only words from the title, company and location) return an empty set.
+    """
+    words = _words(description)[:MAX_DESCRIPTION_WORDS]
+    card_words = set(_words(title)) | set(_words(company)) | set(_words(location)) | {"n", "a"}
+    if set(words) <= card_words:
+        return set()
+
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(features):
+    """
+    MinHash signature of a set of strings: NUM_PERM uint32 values whose
+    pairwise agreement estimates the Jaccard similarity of the sets.
+    """
+    return minhash_many([features])[0]
+
+
+def minhash_many(feature_sets, max_features=MINHASH_BLOCK_FEATURES):
+    """
+    Signatures of several non-empty sets, one row each, hashing up to
+    `max_features` strings per numpy pass to bound memory.
+    """
+    signatures = np.empty((len(feature_sets), NUM_PERM), dtype=np.uint32)
+    start = 0
+    while start < len(feature_sets):
+        end, total = start + 1, len(feature_sets[start])
+        while end < len(feature_sets) and total + len(feature_sets[end]) <= max_features:
+            total += len(feature_sets[end])
+            end += 1
+
+        block = feature_sets[start:end]
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode("utf-8")) for features in block for f in features),
+            dtype=np.uint64, count=total,
+        )
+        permuted = ((np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+        offsets = np.cumsum([0] + [len(features) for features in block[:-1]])
+        signatures[start:end] = np.minimum.reduceat(permuted, offsets, axis=0)
+        start = end
+
+    return signatures
+
+
+def similarity(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+
+def band_buckets(signature):
+    """
+    One (band, bucket) pair per LSH band; jobs sharing any pair become
+    candidates for the same cluster.
+    """
+    return band_buckets_many(signature.reshape(1, NUM_PERM))[0]
+
+
+def band_buckets_many(signatures):
+    raw = signatures.astype(np.uint32).tobytes()
+    size = LSH_ROWS * 4
+    return [
+        [
+            (band, int.from_bytes(
+                hashlib.blake2b(raw[offset + band * size:offset + (band + 1) * size],
+                                digest_size=8).digest(),
+                "big", signed=True,
+            ))
+            for band in range(LSH_BANDS)
+        ]
+        for offset in range(0, len(raw), NUM_PERM * 4)
+    ]
+
+
+def _to_blob(signature):
+    return None if signature is None else signature.astype("<u4").tobytes()
+
+
+def _from_blob(blob):
+    return None if blob is None else np.frombuffer(blob, dtype="<u4")
+
+
+def _lsh_candidates(conn, buckets):
+    """
+    Indexed jobs sharing a bucket with each position of `buckets` (a list of
+    band_buckets results), as {position: [(job_id, signature,
+    description_signature)]}, with one join for the whole batch.
+    """
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS dedup_buckets (pos INTEGER, band INTEGER, bucket INTEGER)"
+    )
+    conn.execute("DELETE FROM temp.dedup_buckets")
+    conn.executemany(
+        "INSERT INTO temp.dedup_buckets (pos, band, bucket) VALUES (?, ?, ?)",
+        # Sorted like job_lsh's key, so the lookups below walk its pages in order.
+        sorted(
+            ((pos, band, bucket) for pos, pairs in enumerate(buckets) if pairs for band, bucket in pairs),
+            key=lambda row: row[1:],
+        ),
+    )
+
+    # CROSS JOIN keeps the small batch table on the outside; left to the
+    # planner, SQLite scans all of job_lsh instead.
+    rows = conn.execute(
+        """
+        SELECT b.pos, m.job_id, m.signature, m.description_signature
+        FROM temp.dedup_buckets b
+        CROSS JOIN job_lsh l
+        CROSS JOIN job_minhash m
+        WHERE l.band = b.band AND l.bucket = b.bucket AND m.job_id = l.job_id
+        """
+    )
+
+    indexed, candidates = {}, {}
+    for pos, job_id, signature, desc_signature in rows:
+        found = candidates.setdefault(pos, {})
+        if job_id in found or len(found) >= MAX_CANDIDATES:
+            continue
+        if job_id not in indexed:
+            indexed[job_id] = (job_id, _from_blob(signature), _from_blob(desc_signature))
+        found[job_id] = indexed[job_id]
+
+    return {pos: [found[job_id] for job_id in sorted(found)] for pos, found in candidates.items()}
+
+
+def _best_cluster(signature, desc_signature, candidates):
+    if not candidates:
+        return None
+
+    scores = (np.stack([c[1] for c in candidates]) == signature).mean(axis=1)
+
+    for i in np.argsort(-scores, kind="stable"):
+        if scores[i] < SIMILARITY_THRESHOLD:
+            break
+
+        other_desc = candidates[i][2]
+        if (desc_signature is not None and other_desc is not None
+                and similarity(desc_signature, other_desc) < DESCRIPTION_THRESHOLD):
+            continue
+        return candidates[i][0]
+
+    return None
+
+
+def _index(conn, entries):
+    """
+    Stores (job_id, signature, description_signature, buckets) entries.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO job_minhash (job_id, signature, description_signature) VALUES (?, ?, ?)",
+        [(job_id, _to_blob(sig), _to_blob(desc)) for job_id, sig, desc, _ in entries],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO job_lsh (band, bucket, job_id) VALUES (?, ?, ?)",
+        sorted((band, bucket, job_id) for job_id, _, _, buckets in entries for band, bucket in buckets),
+    )
+
+
+def index_cluster(conn, job_id, title, company, location, location_clean, description):
+    """
+    Indexes an existing job as the representative of its cluster, e.g. when
+    retention.py archives the previous one.
+    """
+    features = listing_features(title, company, location_clean)
+    if not features:
+        return
+
+    signature = minhash(features)
+    shingles = description_shingles(description, title, company, location)
+    _index(conn, [(job_id, signature, minhash(shingles) if shingles else None, band_buckets(signature))])
+
+
+def unindex_jobs(conn, job_ids, chunk_size=500):
+    """
+    Removes the signatures and LSH buckets of `job_ids`. Buckets are
+    recomputed from the stored signatures so each delete is a key lookup.
+    """
+    job_ids = list(job_ids)
+    for i in range(0, len(job_ids), chunk_size):
+        chunk = job_ids[i:i + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT job_id, signature FROM job_minhash WHERE job_id IN ({placeholders})", chunk
+        ).fetchall()
+        conn.executemany(
+            "DELETE FROM job_lsh WHERE band = ? AND bucket = ? AND job_id = ?",
+            [
+                (band, bucket, job_id)
+                for job_id, blob in rows
+                for band, bucket in band_buckets(_from_blob(blob))
+            ],
+        )
+        conn.execute(f"DELETE FROM job_minhash WHERE job_id IN ({placeholders})", chunk)
+
+
+def assign_cluster_rows(conn, rows):
+    """
+    Sets cluster_id for `rows` of (id, title, company, location,
+    location_clean, description), in id order, and returns {id: cluster_id}.
+    Signatures are computed for the whole batch at once and candidates
+    looked up with one query; rows earlier in the batch are candidates for
+    later ones. Only the first posting of each cluster is indexed
+    (signature and LSH buckets), so later duplicates are compared against
+    one representative per cluster and buckets stay small.
+    """
+    features = [listing_features(title, company, location_clean)
+                for _, title, company, _, location_clean, _ in rows]
+    shingles = [description_shingles(description, title, company, location)
+                for _, title, company, location, _, description in rows]
+
+    has_features = [i for i, f in enumerate(features) if f]
+    has_shingles = [i for i, sh in enumerate(shingles) if sh and features[i]]
+    signatures = [None] * len(rows)
+    desc_signatures = [None] * len(rows)
+    buckets = [None] * len(rows)
+
+    if has_features:
+        computed = minhash_many([features[i] for i in has_features])
+        for i, signature, pairs in zip(has_features, computed, band_buckets_many(computed)):
+            signatures[i], buckets[i] = signature, pairs
+    if has_shingles:
+        for i, signature in zip(has_shingles, minhash_many([shingles[i] for i in has_shingles])):
+            desc_signatures[i] = signature
+
+    candidates = _lsh_candidates(conn, buckets) if has_features else {}
+
+    clusters, new_entries = {}, []
+    batch_buckets = {}
+    for i, row in enumerate(rows):
+        job_id = row[0]
+        cluster_id = None
+
+        if signatures[i] is not None:
+            found = list(candidates.get(i, []))
+            seen = {c[0] for c in found}
+            for pair in buckets[i]:
+                for entry in batch_buckets.get(pair, ()):
+                    if entry[0] not in seen and len(found) < MAX_CANDIDATES:
+                        seen.add(entry[0])
+                        found.append(entry)
+            cluster_id = _best_cluster(signatures[i], desc_signatures[i], found)
+
+        if cluster_id is None:
+            cluster_id = job_id
+            if signatures[i] is not None:
+                new_entries.append((job_id, signatures[i], desc_signatures[i], buckets[i]))
+                for pair in buckets[i]:
+                    batch_buckets.setdefault(pair, []).append(
+                        (job_id, signatures[i], desc_signatures[i])
+                    )
+
+        clusters[job_id] = cluster_id
+
+    _index(conn, new_entries)
+    conn.executemany(
+        "UPDATE jobs SET cluster_id = ? WHERE id = ?",
+        [(cluster_id, job_id) for job_id, cluster_id in clusters.items()],
+    )
+    return clusters
+
+
+def assign_cluster(conn, job_id, title, company, location, location_clean, description):
+    """
+    Sets one job's cluster_id (see assign_cluster_rows) and returns it.
+    """
+    row = (job_id, title, company, location, location_clean, description)
+    return assign_cluster_rows(conn, [row])[job_id]
+
+
+def assign_clusters(conn, after_id=0, chunk_size=5000):
+    """
+    Gives every job with id > `after_id` and no cluster_id one, oldest
+    first: the most similar existing cluster found through the LSH buckets,
+    or a new cluster with the job's own id when there is none. Runs in the
+    caller's transaction and returns the number of jobs assigned.
+    """
+    assigned = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, title, company, location, location_clean, description FROM jobs
+            WHERE cluster_id IS NULL AND id > ? ORDER BY id LIMIT ?
+            """,
+            (after_id, chunk_size),
+        ).fetchall()
+        if not rows:
+            break
+
+        assign_cluster_rows(conn, rows)
+        assigned += len(rows)
+        after_id = rows[-1][0]
+
+    return assigned
+
+
+def refresh_descriptions(conn, job_ids, chunk_size=500):
+    """
+    Call in the same transaction as an update of the jobs' descriptions
+    (enrichment replacing card placeholders). Stores the description
+    signature of cluster representatives, then re-checks the other members
+    of the affected clusters against the DESCRIPTION_THRESHOLD veto, which
+    couldn't apply while they only had placeholders. Members that fail it
+    are assigned again. Returns the ids that now start their own cluster.
+    """
+    clusters = set()
+    job_ids = list(job_ids)
+    for i in range(0, len(job_ids), chunk_size):
+        chunk = job_ids[i:i + chunk_size]
+        rows = conn.execute(
+            f"""
+            SELECT id, cluster_id, title, company, location, description FROM jobs
+            WHERE id IN ({','.join('?' * len(chunk))}) AND cluster_id IS NOT NULL
+            """,
+            chunk,
+        ).fetchall()
+
+        for job_id, cluster_id, title, company, location, description in rows:
+            clusters.add(cluster_id)
+            if job_id == cluster_id:
+                shingles = description_shingles(description, title, company, location)
+                conn.execute(
+                    "UPDATE job_minhash SET description_signature = ? WHERE job_id = ?",
+                    (_to_blob(minhash(shingles)) if shingles else None, job_id),
+                )
+
+    new_clusters = []
+    for cluster_id in clusters:
+        row = conn.execute(
+            "SELECT description_signature FROM job_minhash WHERE job_id = ?", (cluster_id,)
+        ).fetchone()
+        rep_desc = _from_blob(row[0]) if row else None
+        if rep_desc is None:
+            continue
+
+        members = conn.execute(
+            """
+            SELECT id, title, company, location, location_clean, description FROM jobs
+            WHERE cluster_id = ? AND id != ?
+            """,
+            (cluster_id, cluster_id),
+        ).fetchall()
+        for member in members:
+            job_id, title, company, location, _, description = member
+            shingles = description_shingles(description, title, company, location)
+            if not shingles or similarity(minhash(shingles), rep_desc) >= DESCRIPTION_THRESHOLD:
+                continue
+            if assign_cluster(conn, *member) == job_id:
+                new_clusters.append(job_id)
+
+    return new_clusters
@@ -0,0 +1,190 @@
+import atexit
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DRIVER_POOL_SIZE = 2
+DRIVER_MAX_USES = 10
+DRIVER_ACQUIRE_TIMEOUT = 300
+
+
+class DriverPool:
+    """
+    Bounded pool of warm Chrome drivers shared by the Selenium scrapers.
+    Drivers are keyed by their launch config (headless/headed, lean), leased to a
+    scraper and returned afterwards. A driver is recycled after `max_uses`
+    leases, or immediately if it is returned broken or fails a health check.
+    """
+
+    def __init__(self, factory, max_size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+
+        self._cond = threading.Condition()
+        self._idle = {}
+        self._uses = {}
+        self._config = {}
+        self._size = 0
+        self._closed = False
+
+    def _is_healthy(self, driver):
+        try:
+            driver.current_url
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    # _is_healthy and _quit talk to Chrome and can hang, so they are only
+    # called without holding self._cond.
+    def _quit(self, driver):
+        with self._cond:
+            self._uses.pop(id(driver), None)
+            self._config.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _pop_idle_other_than(self, key):
+        for other_key, idle in self._idle.items():
+            if other_key != key and idle:
+                return idle.popleft()
+        return None
+
+    def _launch(self, key):
+        try:
+            driver = self.factory(*key)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._uses[id(driver)] = 0
+            self._config[id(driver)] = key
+        return driver
+
+    def acquire(self, headless=False, lean=False, timeout=DRIVER_ACQUIRE_TIMEOUT):
+        key = (headless, lean)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            candidate = evicted = None
+
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Driver pool is shut down")
+
+                idle = self._idle.get(key)
+                if idle:
+                    candidate = idle.popleft()
+
+                elif self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                else:
+                    # The idle driver's slot goes to the one launched below.
+                    evicted = self._pop_idle_other_than(key)
+                    if evicted is not None:
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a free driver")
+                    self._cond.wait(remaining)
+                    continue
+
+            if self._is_healthy(candidate):
+                with self._cond:
+                    self._uses[id(candidate)] += 1
+                return candidate
+
+            print("[DriverPool] Discarding unhealthy driver")
+            self._quit(candidate)
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+
+        if evicted is not None:
+            self._quit(evicted)
+        driver = self._launch(key)
+        with self._cond:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver, broken=False):
+        if driver is None:
+            return
+
+        with self._cond:
+            key = self._config.get(id(driver))
+            recycle = (
+                broken
+                or self._closed
+                or key is None
+                or self._uses.get(id(driver), 0) >= self.max_uses
+            )
+
+            if not recycle:
+                self._idle.setdefault(key, deque()).append(driver)
+                self._cond.notify()
+                return
+
+            if key is not None:
+                self._size -= 1
+            self._cond.notify()
+
+        self._quit(driver)
+
+    @contextmanager
+    def lease(self, headless=False, lean=False):
+        driver = self.acquire(headless, lean)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def prewarm(self, headless=False, lean=False, count=1):
+        drivers = []
+        try:
+            for _ in range(count):
+                drivers.append(self.acquire(headless, lean))
+        finally:
+            for d in drivers:
+                self.release(d)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            drivers = [d for idle in self._idle.values() for d in idle]
+            self._idle.clear()
+            self._size -= len(drivers)
+            self._cond.notify_all()
+
+        for d in drivers:
+            self._quit(d)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_driver_pool(factory=None):
+    global _default_pool
+
+    with _default_pool_lock:
+        if _default_pool is None:
+            if factory is None:
+                raise RuntimeError("Driver pool has not been created yet")
+            _default_pool = DriverPool(factory)
+            atexit.register(_default_pool.shutdown)
+
+        return _default_pool
@@ -0,0 +1,195 @@
+import asyncio
+import argparse
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+from playwright.async_api import async_playwright
+
+from src.card_parser import HTML_PARSER
+from src.database import init_db, load_jobs_needing_description, update_descriptions
+from src.http_client import make_session, fetch_text, DEFAULT_HEADERS
+from src.rate_limiter import get_rate_limiter
+
+# Where the full description lives on each site's detail page. Sites marked
+# `needs_js` render it client-side, so they go straight to the browser.
+DESCRIPTION_SPECS = {
+    "Indeed": {"css": "#jobDescriptionText", "needs_js": False},
+    "Naukri": {"css": "section[class*='job-desc'], div[class*='dang-inner-html']", "needs_js": True},
+    "LinkedIn": {"css": ".show-more-less-html__markup, .description__text", "needs_js": False},
+    "JobKaka": {"css": ".entry-content", "needs_js": False},
+}
+
+DOMAIN_CONCURRENCY = 4
+BROWSER_CONCURRENCY = 2
+BROWSER_TIMEOUT = 30000
+MAX_DESCRIPTION_CHARS = 20000
+
+
+def extract_description(html, site):
+    spec = DESCRIPTION_SPECS.get(site)
+    if not spec:
+        return None
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    el = soup.select_one(spec["css"])
+    if el is None:
+        return None
+
+    text = el.get_text("\n", strip=True)
+    return text[:MAX_DESCRIPTION_CHARS] or None
+
+
+class DescriptionFetcher:
+    """
+    Fetches full job descriptions over one pooled keep-alive HTTP session,
+    with a concurrency cap per domain. Pages that need JavaScript, or that
+    refuse plain HTTP, are loaded in a small set of shared browser pages.
+    Every fetch takes a token from the per-domain rate limiter the scrapers
+    use, so enrichment doesn't burst a site right after its card scrape.
+    """
+
+    def __init__(self, domain_concurrency=DOMAIN_CONCURRENCY,
+                 browser_concurrency=BROWSER_CONCURRENCY, use_browser=True, limiter=None):
+        self.limiter = limiter or get_rate_limiter()
+        self.domain_concurrency = domain_concurrency
+        self.browser_concurrency = browser_concurrency
+        self.use_browser = use_browser
+
+        self._domain_sems = {}
+        self._browser_sem = None
+        self._browser_lock = None
+        self._playwright = None
+        self._browser = None
+        self.stats = {"http": 0, "browser": 0, "failed": 0}
+
+    def _domain_sem(self, url):
+        domain = urlparse(url).netloc
+        if domain not in self._domain_sems:
+            self._domain_sems[domain] = asyncio.Semaphore(self.domain_concurrency)
+        return self._domain_sems[domain]
+
+    async def _get_browser(self):
+        async with self._browser_lock:
+            if self._browser is None:
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    async def _fetch_with_browser(self, url, site):
+        async with self._browser_sem:
+            await self.limiter.acquire_async(url)
+            browser = await self._get_browser()
+            page = await browser.new_page(user_agent=DEFAULT_HEADERS["User-Agent"])
+            try:
+                await page.route(
+                    "**/*",
+                    lambda route: route.abort()
+                    if route.request.resource_type in ("image", "media", "font")
+                    else route.continue_(),
+                )
+                await page.goto(url, timeout=BROWSER_TIMEOUT, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_selector(
+                        DESCRIPTION_SPECS[site]["css"], timeout=BROWSER_TIMEOUT
+                    )
+                except Exception:
+                    pass
+                return extract_description(await page.content(), site)
+            finally:
+                await page.close()
+
+    async def _fetch_one(self, session, url, site):
+        spec = DESCRIPTION_SPECS.get(site)
+        if not spec or not url or not url.startswith("http"):
+            return None
+
+        desc = None
+        async with self._domain_sem(url):
+            if not spec["needs_js"]:
+                try:
+                    desc = extract_description(
+                        await fetch_text(session, url, limiter=self.limiter), site
+                    )
+                    if desc:
+                        self.stats["http"] += 1
+                        return desc
+                except Exception as e:
+                    print(f"[Enricher] HTTP fetch failed for {url}: {e}")
+
+            if self.use_browser:
+                try:
+                    desc = await self._fetch_with_browser(url, site)
+                    if desc:
+                        self.stats["browser"] += 1
+                        return desc
+                except Exception as e:
+                    print(f"[Enricher] Browser fetch failed for {url}: {e}")
+
+        self.stats["failed"] += 1
+        return None
+
+    async def fetch_all(self, targets):
+        """
+        `targets` is a list of (job_url, site). Returns {job_url: description}
+        for every page a description was found on.
+        """
+        self._browser_sem = asyncio.Semaphore(self.browser_concurrency)
+        self._browser_lock = asyncio.Lock()
+        results = {}
+
+        try:
+            async with make_session() as session:
+                descs = await asyncio.gather(
+                    *(self._fetch_one(session, url, site) for url, site in targets)
+                )
+
+            for (url, _), desc in zip(targets, descs):
+                if desc:
+                    results[url] = desc
+
+        finally:
+            if self._browser is not None:
+                await self._browser.close()
+                await self._playwright.stop()
+                self._browser = None
+
+        return results
+
+
+async def enrich_descriptions(urls=None, limit=None, conn=None, use_browser=True):
+    """
+    Fills in full descriptions for stored jobs that still carry the
+    card-derived placeholder, optionally restricted to `urls`. Returns
+    {job_url: description} for the jobs updated.
+    """
+    own_conn = conn is None
+    conn = conn or init_db()
+
+    try:
+        targets = load_jobs_needing_description(conn, urls, limit)
+        if not targets:
+            return {}
+
+        print(f"[Enricher] Fetching {len(targets)} job descriptions")
+        fetcher = DescriptionFetcher(use_browser=use_browser)
+        results = await fetcher.fetch_all(targets)
+
+        update_descriptions(conn, results)
+        print(
+            f"[Enricher] Done: {fetcher.stats['http']} via HTTP, "
+            f"{fetcher.stats['browser']} via browser, {fetcher.stats['failed']} failed"
+        )
+        return results
+
+    finally:
+        if own_conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch full descriptions for stored jobs.")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--no-browser", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(enrich_descriptions(limit=args.limit, use_browser=not args.no_browser))
@@ -0,0 +1,129 @@
+import re
+import asyncio
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import aiohttp
+
+from src.rate_limiter import looks_blocked
+
+HTTP_POOL_SIZE = 20
+HTTP_PER_HOST = 4
+HTTP_TIMEOUT = 20
+HTTP_RETRIES = 2
+HTTP_BACKOFF = 2.0
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/115.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Explicit "slow down" answers: they also back off the domain's rate limit,
+# and their Retry-After (capped at MAX_RETRY_AFTER seconds) is honored.
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRY_AFTER = 120
+BLOCK_STATUSES = {401, 403, 999}
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+class FetchBlocked(Exception):
+    pass
+
+
+def retry_after_seconds(value):
+    """
+    Parses a Retry-After header (seconds or an HTTP date) into seconds, or
+    None when missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def make_session(limit=HTTP_POOL_SIZE, per_host=HTTP_PER_HOST, timeout=HTTP_TIMEOUT):
+    """
+    Keep-alive session shared by all fetches in a run: connections to each
+    host are pooled and reused, at most `per_host` open at once.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=per_host,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=DEFAULT_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+async def fetch_text(session, url, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF, limiter=None):
+    """
+    GETs a page, retrying transient failures with exponential backoff.
+    Raises FetchBlocked when the site refuses plain HTTP clients.
+    """
+    last_error = None
+
+    for attempt in range(retries + 1):
+        delay = backoff ** attempt
+        if limiter is not None:
+            await limiter.acquire_async(url)
+
+        try:
+            async with session.get(url) as resp:
+                if resp.status in BLOCK_STATUSES:
+                    if limiter is not None:
+                        limiter.report_blocked(url)
+                    raise FetchBlocked(f"HTTP {resp.status} for {url}")
+
+                if resp.status in RETRY_STATUSES:
+                    last_error = RuntimeError(f"HTTP {resp.status} for {url}")
+                    if resp.status in THROTTLE_STATUSES:
+                        if limiter is not None:
+                            limiter.report_blocked(url)
+                        retry_after = retry_after_seconds(resp.headers.get("Retry-After"))
+                        if retry_after is not None:
+                            delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+
+                else:
+                    if resp.status >= 400:
+                        raise RuntimeError(f"HTTP {resp.status} for {url}")
+                    text = await resp.text(errors="replace")
+
+                    title = _TITLE_RE.search(text[:20000])
+                    if looks_blocked(str(resp.url), title.group(1) if title else ""):
+                        if limiter is not None:
+                            limiter.report_blocked(url)
+                        raise FetchBlocked(f"Block page served for {url}")
+
+                    if limiter is not None:
+                        limiter.report_ok(url)
+                    return text
+
+        except FetchBlocked:
+            raise
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_error = e
+
+        if attempt < retries:
+            await asyncio.sleep(delay)
+
+    raise last_error
@@ -0,0 +1,86 @@
+import threading
+
+from src.database import init_db, load_job_urls
+
+# Stop paginating once at least this fraction of a page's cards are known.
+INCREMENTAL_STOP_RATIO = 0.8
+
+
+class KnownUrlIndex:
+    """
+    In-memory set of job URLs already stored in jobs.db. Scrapers check cards
+    against it before extracting their details; URLs are only added once
+    their rows are stored, by `refresh` or `update`.
+    """
+
+    def __init__(self, urls=()):
+        self._urls = set(urls)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_db(cls, conn=None):
+        index = cls()
+        index.refresh(conn)
+        return index
+
+    def refresh(self, conn=None):
+        """
+        Adds the URLs of rows inserted since the last refresh, by any process.
+        Returns how many were added.
+        """
+        own_conn = conn is None
+        conn = conn or init_db()
+        try:
+            rows = list(load_job_urls(conn, self._last_id))
+        finally:
+            if own_conn:
+                conn.close()
+
+        with self._lock:
+            self._urls.update(url for _, url in rows)
+            if rows:
+                self._last_id = max(self._last_id, rows[-1][0])
+        return len(rows)
+
+    def __contains__(self, url):
+        return url in self._urls
+
+    def __len__(self):
+        return len(self._urls)
+
+    def update(self, urls):
+        with self._lock:
+            self._urls.update(urls)
+
+    def is_mostly_known(self, n_known, n_cards, ratio=INCREMENTAL_STOP_RATIO):
+        return n_cards > 0 and n_known >= ratio * n_cards
+
+
+_known_urls = None
+_known_urls_lock = threading.Lock()
+
+
+def get_known_urls():
+    """
+    Returns the process-wide index, loading it on first use and picking up
+    rows other workers or the app stored since on every later call, so a
+    long-lived worker sees them at the start of each scrape.
+    """
+    global _known_urls
+
+    with _known_urls_lock:
+        if _known_urls is None:
+            _known_urls = KnownUrlIndex.from_db()
+            print(f"[Incremental] Loaded {len(_known_urls)} known job URLs")
+        else:
+            _known_urls.refresh()
+        return _known_urls
+
+
+def remember_urls(urls):
+    """
+    Marks just-stored job URLs as known, if the index is loaded.
+    """
+    if _known_urls is not None:
+        _known_urls.update(url for url in urls if url)
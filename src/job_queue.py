@@ -0,0 +1,195 @@
+import json
+import uuid
+
+# A running job whose worker hasn't sent a heartbeat for this long is assumed
+# dead and put back on the queue (or failed after MAX_ATTEMPTS).
+STALE_AFTER_SECONDS = 180
+MAX_ATTEMPTS = 3
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _row_to_job(row, columns):
+    job = dict(zip(columns, row))
+    for key in ("params", "result"):
+        if job.get(key):
+            job[key] = json.loads(job[key])
+    return job
+
+
+def enqueue_scrape_job(conn, kind, params, schedule_id=None):
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO scrape_jobs (kind, params, schedule_id) VALUES (?, ?, ?)",
+            (kind, json.dumps(params), schedule_id),
+        )
+    return cur.lastrowid
+
+
+def get_scrape_job(conn, job_id):
+    cur = conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return _row_to_job(row, [c[0] for c in cur.description])
+
+
+def list_scrape_jobs(conn, limit=20):
+    cur = conn.execute(
+        "SELECT id, kind, status, progress, message, attempts, created_at, "
+        "started_at, finished_at FROM scrape_jobs ORDER BY id DESC LIMIT ?",
+        (limit,),
+    )
+    columns = [c[0] for c in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def claim_scrape_job(conn, worker):
+    """
+    Atomically moves the oldest queued job to running for this worker and
+    returns it, or None if the queue is empty. The single UPDATE holds the
+    write lock, so two workers can never claim the same job.
+    """
+    token = f"{worker}:{uuid.uuid4().hex}"
+    with conn:
+        cur = conn.execute(
+            """
+            UPDATE scrape_jobs
+            SET status = 'running', worker = ?, attempts = attempts + 1,
+                started_at = datetime('now'), heartbeat_at = datetime('now'),
+                progress = 0, message = 'Started'
+            WHERE id = (
+                SELECT id FROM scrape_jobs WHERE status = 'queued' ORDER BY id LIMIT 1
+            ) AND status = 'queued'
+            """,
+            (token,),
+        )
+    if cur.rowcount != 1:
+        return None
+
+    row = conn.execute("SELECT id FROM scrape_jobs WHERE worker = ?", (token,)).fetchone()
+    return get_scrape_job(conn, row[0]) if row else None
+
+
+# The updates below take the `worker` token the job was claimed with and
+# only apply while that claim holds: once a stale job is requeued, the old
+# worker can no longer touch the new attempt. They return False when the
+# claim was lost.
+
+def update_scrape_job_progress(conn, job_id, worker, progress=None, message=None):
+    with conn:
+        cur = conn.execute(
+            """
+            UPDATE scrape_jobs
+            SET progress = COALESCE(?, progress), message = COALESCE(?, message),
+                heartbeat_at = datetime('now')
+            WHERE id = ? AND status = 'running' AND worker = ?
+            """,
+            (progress, message, job_id, worker),
+        )
+    return cur.rowcount == 1
+
+
+def finish_scrape_job(conn, job_id, worker, result):
+    with conn:
+        cur = conn.execute(
+            """
+            UPDATE scrape_jobs
+            SET status = 'done', progress = 100, message = 'Done', result = ?,
+                row_count = ?, finished_at = datetime('now')
+            WHERE id = ? AND status = 'running' AND worker = ?
+            """,
+            (json.dumps(result), len(result.get("jobs", [])), job_id, worker),
+        )
+    return cur.rowcount == 1
+
+
+def fail_scrape_job(conn, job_id, worker, error):
+    with conn:
+        cur = conn.execute(
+            """
+            UPDATE scrape_jobs
+            SET status = 'failed', error = ?, message = 'Failed',
+                finished_at = datetime('now')
+            WHERE id = ? AND status = 'running' AND worker = ?
+            """,
+            (str(error), job_id, worker),
+        )
+    return cur.rowcount == 1
+
+
+def requeue_stale_scrape_jobs(conn, stale_after=STALE_AFTER_SECONDS, max_attempts=MAX_ATTEMPTS):
+    """
+    Recovers jobs left running by a crashed or killed worker. Returns the
+    number of jobs requeued.
+    """
+    cutoff = f"-{int(stale_after)} seconds"
+    with conn:
+        conn.execute(
+            """
+            UPDATE scrape_jobs
+            SET status = 'failed', error = 'Worker died too many times',
+                finished_at = datetime('now')
+            WHERE status = 'running' AND heartbeat_at < datetime('now', ?)
+              AND attempts >= ?
+            """,
+            (cutoff, max_attempts),
+        )
+        cur = conn.execute(
+            """
+            UPDATE scrape_jobs
+            SET status = 'queued', worker = NULL, message = 'Requeued after worker loss'
+            WHERE status = 'running' AND heartbeat_at < datetime('now', ?)
+            """,
+            (cutoff,),
+        )
+    return cur.rowcount
+
+
+def count_active_scrape_jobs(conn):
+    return conn.execute(
+        "SELECT COUNT(*) FROM scrape_jobs WHERE status IN ('queued', 'running')"
+    ).fetchone()[0]
+
+
+def add_schedule(conn, name, kind, params, cron, jitter_seconds=300, next_run_at=None):
+    with conn:
+        cur = conn.execute(
+            """
+            INSERT INTO scrape_schedules (name, kind, params, cron, jitter_seconds, next_run_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (name, kind, json.dumps(params), cron, jitter_seconds, next_run_at),
+        )
+    return cur.lastrowid
+
+
+def set_schedule_enabled(conn, schedule_id, enabled):
+    with conn:
+        conn.execute(
+            "UPDATE scrape_schedules SET enabled = ? WHERE id = ?",
+            (1 if enabled else 0, schedule_id),
+        )
+
+
+def list_schedules(conn, enabled_only=False):
+    query = "SELECT * FROM scrape_schedules"
+    if enabled_only:
+        query += " WHERE enabled = 1"
+    cur = conn.execute(query + " ORDER BY id")
+    columns = [c[0] for c in cur.description]
+    return [_row_to_job(row, columns) for row in cur.fetchall()]
+
+
+def schedule_run_history(conn, schedule_id, limit=20):
+    cur = conn.execute(
+        """
+        SELECT id, status, created_at, started_at, finished_at, row_count, error,
+               ROUND((julianday(finished_at) - julianday(started_at)) * 86400, 1)
+                   AS duration_s
+        FROM scrape_jobs WHERE schedule_id = ? ORDER BY id DESC LIMIT ?
+        """,
+        (schedule_id, limit),
+    )
+    columns = [c[0] for c in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
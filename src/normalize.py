@@ -0,0 +1,219 @@
+import re
+from datetime import datetime
+
+UNKNOWN = "Unknown"
+
+EXP_BUCKETS = ["0-1 years", "1-3 years", "3-5 years", "5-10 years", "10+ years"]
+
+# Normalized columns stored next to the raw scraped text, computed once at
+# insert time (see database.insert_jobs) instead of on every page view.
+DERIVED_COLUMNS = {
+    "date_iso": "TEXT",
+    "exp_min": "REAL",
+    "exp_max": "REAL",
+    "exp_bucket": "TEXT",
+    "salary_min": "REAL",
+    "salary_max": "REAL",
+    "salary_period": "TEXT",
+    "location_clean": "TEXT",
+}
+
+ALL_KNOWN_SKILLS = [
+    
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Swift", "Kotlin", "PHP", "Ruby", "SQL", "R", "Matlab",
+    
+    "React", "Angular", "Vue", "Next.js", "Node.js", "Django", "Flask", "Spring Boot", "ASP.NET", "Laravel", "HTML", "CSS", "Redux", "jQuery", "Bootstrap", "Tailwind",
+   
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Keras", "OpenCV", "NLP", "LLM", "Generative AI", "Hugging Face",
+   
+    "AWS", "Azure", "Google Cloud", "GCP", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible", "Linux", "Git", "CI/CD", "GitHub", "GitLab",
+    
+    "Unity", "Unreal Engine", "Godot", "OpenGL", "DirectX", "Shaders", "Blender", "Maya", "3D Math", "Physics", "C#", "Lua",
+   
+    "PostgreSQL", "MongoDB", "MySQL", "Redis", "Elasticsearch", "Oracle", "DynamoDB", "Firebase",
+    
+    "Agile", "Scrum", "JIRA", "Rest API", "GraphQL", "Microservices"
+]
+
+# Whole-word matcher for ALL_KNOWN_SKILLS that doesn't need spaCy, used
+# where skills are counted at insert time (rollups.py). Skills that are also
+# ordinary words or letters only match as written, and not in phrases like
+# "go to market" or "R&D".
+_WORD_SKILLS = {"Go", "R", "Rust", "Swift", "Ruby", "Unity", "Maya", "Oracle", "Physics"}
+_SKILL_NAMES = {skill.lower(): skill for skill in ALL_KNOWN_SKILLS}
+
+
+def _skill_re(skills, flags=0, not_before=""):
+    return re.compile(
+        r"(?<![\w+#.])("
+        + "|".join(
+            r"\s+".join(re.escape(word) for word in skill.split())
+            for skill in sorted(skills, key=len, reverse=True)
+        )
+        + rf")(?![\w+#]|\.\w{not_before})",
+        flags,
+    )
+
+
+_SKILL_RE = _skill_re(set(_SKILL_NAMES) - {s.lower() for s in _WORD_SKILLS}, re.IGNORECASE)
+_WORD_SKILL_RE = _skill_re(_WORD_SKILLS, not_before=r"|\s*[&-]|\s+to\b")
+
+_NUMBER_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k\b)?")
+
+SALARY_PERIODS = (
+    ("hour", ("hour", "/hr", "per hr")),
+    ("day", ("day", "per diem")),
+    ("week", ("week",)),
+    ("month", ("month", "p.m", "/pm", " pm")),
+    ("year", ("year", "annum", "p.a", " pa", "lpa", "lac", "lakh", "ctc")),
+)
+
+SALARY_MULTIPLIERS = (
+    (("crore", " cr"), 10_000_000),
+    (("lac", "lakh", "lpa"), 100_000),
+)
+
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d %Y",
+    "%B %d %Y",
+)
+
+_DATE_RES = (
+    re.compile(r"\d{4}-\d{2}-\d{2}"),
+    re.compile(r"\d{1,2}[/.-]\d{1,2}[/.-]\d{4}"),
+    re.compile(r"\d{1,2}(?:st|nd|rd|th)?\s+[A-Za-z]{3,9},?\s+\d{4}"),
+    re.compile(r"[A-Za-z]{3,9}\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}"),
+)
+
+
+def clean_location(location_text):
+    if not isinstance(location_text, str): return UNKNOWN
+    return location_text.split(",")[0].strip()
+
+
+def exp_range(text):
+    """
+    Returns (min, max) years of experience from text like "2-5 Yrs",
+    "Fresher" or "3+ years", or (None, None) if there is no number.
+    """
+    if not isinstance(text, str):
+        return None, None
+
+    x = text.lower().strip()
+    if x in ["n/a", "", "not disclosed", "unknown"]:
+        return None, None
+
+    if "fresher" in x:
+        return 0.0, 1.0
+
+    nums = [float(n) for n in re.findall(r"\d+", x)]
+    if not nums:
+        return None, None
+
+    return nums[0], nums[1] if len(nums) > 1 else nums[0]
+
+
+def exp_bucket(exp_max):
+    if exp_max is None:
+        return UNKNOWN
+    if exp_max <= 1:
+        return "0-1 years"
+    elif exp_max <= 3:
+        return "1-3 years"
+    elif exp_max <= 5:
+        return "3-5 years"
+    elif exp_max <= 10:
+        return "5-10 years"
+    else:
+        return "10+ years"
+
+
+def parse_salary(text):
+    """
+    Returns (min, max, period) in rupees from text like "10-15 Lacs PA" or
+    "₹25,000 - ₹35,000 a month". Lakh/crore amounts are expanded; the
+    period is None when the text doesn't say.
+    """
+    if not isinstance(text, str):
+        return None, None, None
+
+    x = f" {text.lower()} "
+    amounts = [
+        float(num.replace(",", "")) * (1000 if k else 1)
+        for num, k in _NUMBER_RE.findall(x)
+        if num.replace(",", "").replace(".", "").isdigit()
+    ]
+    if not amounts:
+        return None, None, None
+
+    for markers, factor in SALARY_MULTIPLIERS:
+        if any(m in x for m in markers):
+            amounts = [a * factor for a in amounts]
+            break
+
+    period = next(
+        (name for name, markers in SALARY_PERIODS if any(m in x for m in markers)),
+        None,
+    )
+
+    if "up to" in x or "upto" in x:
+        return None, amounts[0], period
+    return amounts[0], amounts[1] if len(amounts) > 1 else amounts[0], period
+
+
+def parse_date(text):
+    """
+    Returns the first recognisable calendar date in `text` as YYYY-MM-DD
+    (scrapers already resolve "3 days ago" style dates), else None.
+    """
+    if not isinstance(text, str):
+        return None
+
+    for pattern in _DATE_RES:
+        match = pattern.search(text)
+        if not match:
+            continue
+
+        candidate = re.sub(r"(\d)(st|nd|rd|th)", r"\1", match.group(0)).replace(",", "")
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(candidate, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+
+    return None
+
+
+def find_skills(text):
+    """
+    Returns the set of ALL_KNOWN_SKILLS mentioned in `text`.
+    """
+    if not isinstance(text, str):
+        return set()
+    found = {_SKILL_NAMES[" ".join(m.lower().split())] for m in _SKILL_RE.findall(text)}
+    return found | set(_WORD_SKILL_RE.findall(text))
+
+
+def derive_columns(job):
+    """
+    Computes the DERIVED_COLUMNS values for a scraped job dict.
+    """
+    exp_min, exp_max = exp_range(job.get("experience"))
+    salary_min, salary_max, salary_period = parse_salary(job.get("salary"))
+
+    return {
+        "date_iso": parse_date(job.get("date_posted")),
+        "exp_min": exp_min,
+        "exp_max": exp_max,
+        "exp_bucket": exp_bucket(exp_max),
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "salary_period": salary_period,
+        "location_clean": clean_location(job.get("location")),
+    }
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.scraper import SeleniumScraper, LinkedInScraper
+from src.incremental import get_known_urls
+
+PRIVATE_SITES = ["Indeed", "Naukri", "LinkedIn"]
+
+SITE_TIMEOUTS = {
+    "Indeed": 600,
+    "Naukri": 600,
+    "LinkedIn": 300,
+}
+
+MAX_SELENIUM_WORKERS = 2
+
+
+def _run_indeed(opts, keyword, location, limit, time_filter, work_type, exp_level):
+    return SeleniumScraper(**opts).scrape_indeed(keyword, limit, time_filter)
+
+
+def _run_naukri(opts, keyword, location, limit, time_filter, work_type, exp_level):
+    return SeleniumScraper(**opts).scrape_naukri(keyword, location, limit)
+
+
+SELENIUM_RUNNERS = {
+    "Indeed": _run_indeed,
+    "Naukri": _run_naukri,
+}
+
+
+def _run_selenium_batch(site, opts, queries, limit, time_filter):
+    return SeleniumScraper(**opts).scrape_batch(site, queries, limit, time_filter)
+
+
+async def _run_site(site, executor, args, timeout, opts, queries=None):
+    start = time.perf_counter()
+    keyword, location, limit, time_filter, work_type, exp_level = args
+    linkedin_opts = {k: v for k, v in opts.items() if k != "resume"}
+
+    if site in SELENIUM_RUNNERS:
+        loop = asyncio.get_running_loop()
+        if queries:
+            task = loop.run_in_executor(
+                executor, _run_selenium_batch, site, opts, queries, limit, time_filter
+            )
+        else:
+            task = loop.run_in_executor(executor, SELENIUM_RUNNERS[site], opts, *args)
+    elif queries:
+        task = LinkedInScraper(**linkedin_opts).scrape_batch(
+            queries, limit, time_filter, work_type, exp_level
+        )
+    else:
+        task = LinkedInScraper(**linkedin_opts).scrape(
+            keyword, location, limit, time_filter, work_type, exp_level
+        )
+
+    try:
+        res = await asyncio.wait_for(task, timeout=timeout)
+        error = None
+    except asyncio.TimeoutError:
+        res = []
+        error = f"timed out after {timeout}s"
+    except Exception as e:
+        res = []
+        error = str(e)
+
+    elapsed = time.perf_counter() - start
+    if error:
+        print(f"[{site} Scraper Error] {error}")
+    else:
+        print(f"[{site}] Finished in {elapsed:.1f}s with {len(res)} jobs")
+
+    return site, res or [], error
+
+
+async def scrape_private_sites(keyword, location, limit, time_filter, work_type,
+                               exp_level, sites, on_site_done=None, timeouts=None,
+                               lean=False, incremental=False, resume=False, queries=None,
+                               record=False):
+    """
+    Runs the selected private-sector scrapers concurrently. Selenium scrapers
+    run on a thread pool, LinkedIn (Playwright) runs on the event loop.
+    `on_site_done(site, jobs, error, finished, total)` is called as each site
+    completes, in completion order. `lean` skips images, fonts and trackers;
+    `incremental` skips postings already in jobs.db and stops paginating once
+    a page is mostly known. `resume` lets Indeed and Naukri continue from
+    the checkpoint left by an earlier failed run with the same filters.
+    `queries` ({"keyword", "location"} dicts) switches every site to a batch
+    scrape over one warm session, with timeouts scaled by the batch size.
+    `record` saves every listing page as a replay fixture (see replay.py).
+    """
+    timeouts = {**SITE_TIMEOUTS, **(timeouts or {})}
+    if queries:
+        timeouts = {site: t * len(queries) for site, t in timeouts.items()}
+    sites = [s for s in PRIVATE_SITES if s in sites]
+
+    jobs = []
+    counts = {s: 0 for s in PRIVATE_SITES}
+    errors = {}
+
+    if not sites:
+        return jobs, counts, errors
+
+    args = (keyword, location, limit, time_filter, work_type, exp_level)
+    opts = {
+        "lean": lean,
+        "known_urls": get_known_urls() if incremental else None,
+        "resume": resume,
+        "record": record,
+    }
+    n_selenium = sum(1 for s in sites if s in SELENIUM_RUNNERS)
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(n_selenium, MAX_SELENIUM_WORKERS)),
+        thread_name_prefix="scraper",
+    )
+
+    try:
+        tasks = [
+            asyncio.ensure_future(_run_site(s, executor, args, timeouts[s], opts, queries))
+            for s in sites
+        ]
+
+        finished = 0
+        for next_done in asyncio.as_completed(tasks):
+            site, res, error = await next_done
+            finished += 1
+
+            jobs.extend(res)
+            counts[site] = len(res)
+            if error:
+                errors[site] = error
+
+            if on_site_done:
+                on_site_done(site, res, error, finished, len(sites))
+
+    finally:
+        # A timed-out Selenium thread cannot be cancelled; don't block on it.
+        executor.shutdown(wait=False)
+
+    return jobs, counts, errors
@@ -0,0 +1,114 @@
+from src.csv_sink import CsvSink
+from src.database import init_db, insert_jobs, attach_cluster_ids, CSV_PATH, CSV_COLUMNS
+from src.orchestrator import scrape_private_sites
+from src.incremental import remember_urls
+from src.enricher import enrich_descriptions
+from src.scraper import JobKakaHttpScraper
+from src.tracing import span
+
+
+def _noop_progress(percent, message):
+    pass
+
+
+def _persist(conn, site, jobs):
+    with span("persist.db", site=site, rows=len(jobs)):
+        result = insert_jobs(conn, jobs)
+    remember_urls(job["job_url"] for job in result["new"])
+
+    print(
+        f"[{site}] Saved {result['inserted']} new jobs, "
+        f"{result['ignored']} already stored, {len(result['failed'])} failed"
+    )
+    for failure in result["failed"]:
+        print(f"[{site}] Could not save {failure['job_url']}: {failure['error']}")
+
+    return result
+
+
+async def run_hybrid_scrape(keyword, location, limit, time_filter, work_type, exp_level,
+                            use_indeed, use_naukri, use_linkedin, lean=False,
+                            incremental=False, fetch_descriptions=False, resume=False,
+                            queries=None, record=False, progress=None):
+    """
+    Scrapes the selected private-sector sites and persists the results.
+    With `queries`, each site runs a batch over all of them instead of the
+    single keyword. `record` saves the listing pages as replay fixtures for
+    bench_parsers.py. `progress(percent, message)` is called as sites finish.
+    Returns (jobs, counts).
+    """
+    progress = progress or _noop_progress
+    conn = init_db()
+    # Only rows the database actually inserted go to the CSV, so it carries
+    # the same de-duplication as jobs.db.
+    csv_sink = CsvSink(CSV_PATH, CSV_COLUMNS).open()
+
+    sites = [
+        site for site, enabled in (
+            ("Indeed", use_indeed),
+            ("Naukri", use_naukri),
+            ("LinkedIn", use_linkedin),
+        ) if enabled
+    ]
+    progress(0, f"Running {', '.join(sites)} scrapers...")
+
+    def on_site_done(site, res, error, finished, total):
+        result = _persist(conn, site, res)
+
+        with span("persist.csv", site=site, rows=len(result["new"])):
+            csv_sink.write(result["new"])
+            csv_sink.flush()
+
+        pending = total - finished
+        if error:
+            message = f"{site} failed ({error}). Waiting on {pending} more..."
+        else:
+            message = f"{site} done ({len(res)} jobs). Waiting on {pending} more..."
+        progress(int(90 * finished / total), message)
+
+    try:
+        jobs, counts, errors = await scrape_private_sites(
+            keyword, location, limit, time_filter, work_type, exp_level,
+            sites, on_site_done=on_site_done, lean=lean, incremental=incremental,
+            resume=resume, queries=queries, record=record,
+        )
+        if fetch_descriptions and jobs:
+            progress(90, f"Fetching full descriptions for {len(jobs)} jobs...")
+            with span("enrich.descriptions", rows=len(jobs)):
+                descriptions = await enrich_descriptions(
+                    [j["job_url"] for j in jobs], conn=conn
+                )
+            for j in jobs:
+                j["description"] = descriptions.get(j["job_url"], j["description"])
+
+        attach_cluster_ids(conn, jobs)
+
+    finally:
+        csv_sink.close()
+        conn.close()
+
+    progress(100, "Done")
+    return jobs, counts
+
+
+async def run_govt_scrape(limit, state_filter="None", record=False, progress=None):
+    progress = progress or _noop_progress
+    query = state_filter if state_filter.strip() else "None"
+
+    progress(0, "Fetching JobKaka listings...")
+    jobs = await JobKakaHttpScraper(record=record).scrape(limit, query)
+
+    conn = init_db()
+    _persist(conn, "JobKaka", jobs)
+    conn.close()
+
+    progress(100, "Done")
+    return jobs, {"JobKaka": len(jobs)}
+
+
+# Job kinds the background worker knows how to run, keyed as stored in
+# scrape_jobs.kind; params are passed through as keyword arguments.
+SCRAPE_RUNNERS = {
+    "private": run_hybrid_scrape,
+    "govt": run_govt_scrape,
+}
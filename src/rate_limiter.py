@@ -0,0 +1,171 @@
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+# Requests per second allowed per domain. `burst` is the bucket size, `jitter`
+# adds up to that fraction of one interval to every wait. After a block the
+# rate is multiplied by `backoff` (down to `min_rate`); after `recover_after`
+# healthy responses in a row it is multiplied by `recovery` (up to `max_rate`).
+DEFAULT_POLICY = {
+    "rate": 0.2,
+    "burst": 1,
+    "jitter": 0.3,
+    "min_rate": 0.02,
+    "max_rate": 0.5,
+    "backoff": 0.5,
+    "recovery": 1.2,
+    "recover_after": 3,
+}
+
+DOMAIN_POLICIES = {
+    "in.indeed.com": {"rate": 1 / 6, "max_rate": 0.25},
+    "www.naukri.com": {"rate": 0.2, "max_rate": 0.33},
+    "www.linkedin.com": {"rate": 0.25, "burst": 2, "max_rate": 0.5},
+    "www.jobkaka.com": {"rate": 1.0, "burst": 3, "max_rate": 2.0},
+}
+
+BLOCK_MARKERS = [
+    "captcha",
+    "access denied",
+    "are you a robot",
+    "unusual traffic",
+    "just a moment",
+    "verify you are human",
+    "request blocked",
+    "authwall",
+]
+
+
+def domain_of(url_or_domain):
+    if "://" not in url_or_domain:
+        return url_or_domain
+    return urlparse(url_or_domain).netloc
+
+
+def looks_blocked(*texts):
+    for text in texts:
+        if not text:
+            continue
+        text = text.lower()
+        if any(marker in text for marker in BLOCK_MARKERS):
+            return True
+    return False
+
+
+class DomainRateLimiter:
+    """
+    Per-domain token bucket shared by all scrapers in the process. Callers
+    reserve a token before each navigation and report whether the response
+    looked healthy or blocked, which tightens or loosens the domain's rate.
+    """
+
+    def __init__(self, policies=None, default_policy=None):
+        self.policies = {**DOMAIN_POLICIES, **(policies or {})}
+        self.default_policy = {**DEFAULT_POLICY, **(default_policy or {})}
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            policy = {**self.default_policy, **self.policies.get(domain, {})}
+            bucket = {
+                "policy": policy,
+                "rate": policy["rate"],
+                "tokens": float(policy["burst"]),
+                "updated": time.monotonic(),
+                "healthy": 0,
+                "requests": 0,
+                "blocks": 0,
+                "throttled": 0.0,
+            }
+            self._buckets[domain] = bucket
+        return bucket
+
+    def _reserve(self, domain):
+        with self._lock:
+            bucket = self._bucket(domain)
+            policy = bucket["policy"]
+            now = time.monotonic()
+
+            elapsed = now - bucket["updated"]
+            bucket["tokens"] = min(
+                policy["burst"], bucket["tokens"] + elapsed * bucket["rate"]
+            )
+            bucket["updated"] = now
+
+            # Taking the token up front (possibly going negative) queues
+            # concurrent callers behind each other instead of letting them
+            # all wake up at the same moment.
+            bucket["tokens"] -= 1
+            wait = 0.0
+            if bucket["tokens"] < 0:
+                wait = -bucket["tokens"] / bucket["rate"]
+                wait += random.uniform(0, policy["jitter"] / bucket["rate"])
+
+            bucket["requests"] += 1
+            bucket["throttled"] += wait
+            return wait
+
+    def acquire(self, url_or_domain):
+        wait = self._reserve(domain_of(url_or_domain))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url_or_domain):
+        wait = self._reserve(domain_of(url_or_domain))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def report_blocked(self, url_or_domain):
+        domain = domain_of(url_or_domain)
+        with self._lock:
+            bucket = self._bucket(domain)
+            policy = bucket["policy"]
+            bucket["rate"] = max(policy["min_rate"], bucket["rate"] * policy["backoff"])
+            bucket["tokens"] = min(bucket["tokens"], 0.0)
+            bucket["healthy"] = 0
+            bucket["blocks"] += 1
+            rate = bucket["rate"]
+
+        print(f"[RateLimiter] Block signal from {domain}, slowing to {rate:.3f} req/s")
+
+    def report_ok(self, url_or_domain):
+        with self._lock:
+            bucket = self._bucket(domain_of(url_or_domain))
+            policy = bucket["policy"]
+            bucket["healthy"] += 1
+            if bucket["healthy"] >= policy["recover_after"]:
+                bucket["rate"] = min(
+                    policy["max_rate"], bucket["rate"] * policy["recovery"]
+                )
+                bucket["healthy"] = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                domain: {
+                    "rate": round(b["rate"], 4),
+                    "requests": b["requests"],
+                    "blocks": b["blocks"],
+                    "throttled_s": round(b["throttled"], 2),
+                }
+                for domain, b in self._buckets.items()
+            }
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    global _default_limiter
+
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = DomainRateLimiter()
+        return _default_limiter
@@ -0,0 +1,91 @@
+import os
+import json
+import argparse
+from datetime import datetime
+
+from src.card_parser import SITE_SPECS, parse_cards, extract_fields_soup
+
+# Bump the version when a site's markup changes enough that old recordings
+# no longer represent it; old fixture sets stay on disk for comparison.
+FIXTURES_VERSION = "v1"
+FIXTURES_ROOT = os.path.join("data", "fixtures")
+
+
+def fixtures_dir(site, version=FIXTURES_VERSION):
+    return os.path.join(FIXTURES_ROOT, version, site.lower())
+
+
+def record_page(site, html, url, version=FIXTURES_VERSION):
+    """
+    Saves the raw HTML of a listing page plus its URL, so relative links
+    resolve the same way on replay.
+    """
+    out_dir = fixtures_dir(site, version)
+    os.makedirs(out_dir, exist_ok=True)
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    name = f"{stamp}.html"
+
+    with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+        f.write(html)
+
+    with open(os.path.join(out_dir, "manifest.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"file": name, "url": url, "recorded_at": stamp}) + "\n")
+
+    print(f"[Replay] Recorded {site} page to {name}")
+
+
+def load_pages(site, version=FIXTURES_VERSION):
+    out_dir = fixtures_dir(site, version)
+    manifest = os.path.join(out_dir, "manifest.jsonl")
+    if not os.path.exists(manifest):
+        return []
+
+    pages = []
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            path = os.path.join(out_dir, entry["file"])
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as page:
+                pages.append((page.read(), entry["url"]))
+    return pages
+
+
+def replay_site(site, query=None, version=FIXTURES_VERSION):
+    """
+    Runs recorded pages for a site through the scrapers' snapshot parsing
+    code and returns the resulting job dicts.
+    """
+    from src.scraper import JOB_BUILDERS
+
+    spec = SITE_SPECS[site]
+    build = JOB_BUILDERS[site]
+    jobs = []
+
+    for html, url in load_pages(site, version):
+        for card in parse_cards(html, spec):
+            try:
+                fields = extract_fields_soup(card, spec, url)
+                job = build(fields, query) if site == "JobKaka" else build(fields)
+                jobs.append(job)
+            except Exception as e:
+                print(f"[Replay] {site}: error parsing card: {e}")
+
+    return jobs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse recorded listing pages offline.")
+    parser.add_argument("sites", nargs="*", default=list(SITE_SPECS))
+    parser.add_argument("--version", default=FIXTURES_VERSION)
+    args = parser.parse_args()
+
+    for site in args.sites:
+        jobs = replay_site(site, version=args.version)
+        print(f"[Replay] {site}: {len(jobs)} jobs from {len(load_pages(site, args.version))} pages")
+        for job in jobs[:5]:
+            print(f"    {job['title']} | {job['company']} | {job['job_url']}")
@@ -0,0 +1,378 @@
+import os
+import csv
+import hashlib
+import argparse
+from datetime import date, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.csv_sink import CsvSink
+from src.database import DATA_DIR, DB_PATH, CSV_PATH, init_db
+from src.dedup import index_cluster, unindex_jobs
+from src.rollups import apply_rollups
+
+# Archived jobs are zstd Parquet files under site=<site>/month=<YYYY-MM>/.
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive", "jobs")
+ARCHIVE_CHUNK_ROWS = 5000
+STREAM_BATCH_ROWS = 50000
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("site", pa.string()), ("month", pa.string())]), flavor="hive"
+)
+
+# Columns copied from jobs.db. Repetitive strings are dictionary-encoded in
+# the Parquet files and come back as pandas categoricals.
+ARCHIVE_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("title", pa.dictionary(pa.int32(), pa.string())),
+    ("company", pa.dictionary(pa.int32(), pa.string())),
+    ("location", pa.dictionary(pa.int32(), pa.string())),
+    ("salary", pa.dictionary(pa.int32(), pa.string())),
+    ("experience", pa.dictionary(pa.int32(), pa.string())),
+    ("description", pa.string()),
+    ("job_url", pa.string()),
+    ("date_posted", pa.dictionary(pa.int32(), pa.string())),
+    ("date_iso", pa.dictionary(pa.int32(), pa.string())),
+    ("exp_min", pa.float64()),
+    ("exp_max", pa.float64()),
+    ("exp_bucket", pa.dictionary(pa.int32(), pa.string())),
+    ("salary_min", pa.float64()),
+    ("salary_max", pa.float64()),
+    ("salary_period", pa.dictionary(pa.int32(), pa.string())),
+    ("location_clean", pa.dictionary(pa.int32(), pa.string())),
+    ("cluster_id", pa.int64()),
+    ("canonical", pa.bool_()),
+    ("site", pa.string()),
+    ("month", pa.string()),
+])
+
+PARQUET_OPTIONS = ds.ParquetFileFormat().make_write_options(compression="zstd")
+
+# Whether the job was the first posting of its near-duplicate cluster (see
+# dedup.py) when it was archived.
+ARCHIVE_EXPRESSIONS = {"canonical": "cluster_id IS id"}
+ARCHIVE_COLUMNS_SQL = ", ".join(
+    f"{ARCHIVE_EXPRESSIONS[f.name]} AS {f.name}" if f.name in ARCHIVE_EXPRESSIONS else f.name
+    for f in ARCHIVE_SCHEMA if f.name != "month"
+)
+
+# Jobs posted more than max_age_days ago, or older than the newest max_rows
+# of their site, move to the archive. None disables a limit. Jobs without a
+# posting date only count against max_rows.
+DEFAULT_POLICY = {"max_age_days": 365, "max_rows": 250000}
+RETENTION_POLICIES = {
+    # Government notices close within weeks of being posted.
+    "JobKaka": {"max_age_days": 180},
+}
+
+IN_BATCH_SQL = "id IN (SELECT id FROM temp.retention_batch)"
+
+
+def site_policy(site, overrides=None):
+    return {**DEFAULT_POLICY, **RETENTION_POLICIES.get(site, {}), **(overrides or {})}
+
+
+def _expired_sql(conn, site, policy, today):
+    conditions, params = [], []
+
+    if policy.get("max_age_days") is not None:
+        conditions.append("date_iso < ?")
+        params.append((today - timedelta(days=policy["max_age_days"])).isoformat())
+
+    if policy.get("max_rows") is not None:
+        row = conn.execute(
+            "SELECT id FROM jobs WHERE site IS ? ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (site, policy["max_rows"]),
+        ).fetchone()
+        if row:
+            conditions.append("id <= ?")
+            params.append(row[0])
+
+    if not conditions:
+        return None, None
+    return f"site IS ? AND ({' OR '.join(conditions)})", [site, *params]
+
+
+def _write_archive(df, basename):
+    """
+    Writes rows selected with ARCHIVE_COLUMNS_SQL as Parquet files under
+    ARCHIVE_DIR/site=<site>/month=<YYYY-MM>/. Files named after `basename`
+    replace earlier ones of the same name.
+    """
+    df = df.copy()
+    df["site"] = df["site"].fillna("unknown")
+    df["month"] = df["date_iso"].str[:7].fillna("unknown")
+    df["canonical"] = df["canonical"].astype(bool)
+
+    table = pa.Table.from_pandas(df, schema=ARCHIVE_SCHEMA, preserve_index=False)
+    ds.write_dataset(
+        table,
+        ARCHIVE_DIR,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"{basename}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=PARQUET_OPTIONS,
+    )
+
+
+def _set_batch(conn, ids):
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_batch (id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.retention_batch")
+    conn.executemany("INSERT INTO temp.retention_batch (id) VALUES (?)", [(i,) for i in ids])
+
+
+def _archive_batch(conn, ids):
+    """
+    Moves the jobs in `ids` to the archive in the caller's transaction,
+    keeping the rollups and near-duplicate clusters consistent.
+    """
+    _set_batch(conn, ids)
+    df = pd.read_sql_query(f"SELECT {ARCHIVE_COLUMNS_SQL} FROM jobs WHERE {IN_BATCH_SQL}", conn)
+    # Named after the batch, so a retry after a failed commit replaces
+    # these files instead of archiving the rows twice.
+    _write_archive(df, basename=f"jobs-{ids[0]}")
+
+    apply_rollups(conn, IN_BATCH_SQL, sign=-1)
+
+    # A cluster whose first posting is archived while later ones stay is
+    # taken over by the oldest remaining posting.
+    promoted = conn.execute(
+        f"""
+        SELECT cluster_id, MIN(id) FROM jobs
+        WHERE cluster_id IN (SELECT id FROM temp.retention_batch) AND NOT {IN_BATCH_SQL}
+        GROUP BY cluster_id
+        """
+    ).fetchall()
+
+    unindex_jobs(conn, ids)
+    conn.execute(f"DELETE FROM jobs WHERE {IN_BATCH_SQL}")
+
+    for old_id, new_id in promoted:
+        conn.execute("UPDATE jobs SET cluster_id = ? WHERE cluster_id = ?", (new_id, old_id))
+        index_cluster(conn, *conn.execute(
+            "SELECT id, title, company, location, location_clean, description FROM jobs WHERE id = ?",
+            (new_id,),
+        ).fetchone())
+
+    if promoted:
+        _set_batch(conn, [new_id for _, new_id in promoted])
+        apply_rollups(conn, IN_BATCH_SQL, sites=False)
+
+    return len(df)
+
+
+def archive_expired(conn=None, overrides=None, today=None, chunk_size=ARCHIVE_CHUNK_ROWS,
+                    dry_run=False):
+    """
+    Moves the jobs each site's policy (see site_policy; `overrides` applies
+    to every site) expires from jobs.db to the archive, oldest first,
+    `chunk_size` rows per transaction. Returns {site: jobs archived}, or
+    the jobs that would be with `dry_run`.
+    """
+    own_conn = conn is None
+    conn = conn or init_db()
+    today = today or date.today()
+    archived = {}
+
+    try:
+        sites = [row[0] for row in conn.execute("SELECT DISTINCT site FROM jobs")]
+        for site in sites:
+            where, params = _expired_sql(conn, site, site_policy(site, overrides), today)
+            if where is None:
+                continue
+
+            if dry_run:
+                archived[site] = conn.execute(
+                    f"SELECT COUNT(*) FROM jobs WHERE {where}", params
+                ).fetchone()[0]
+                continue
+
+            total = 0
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    ids = [row[0] for row in conn.execute(
+                        f"SELECT id FROM jobs WHERE {where} ORDER BY id LIMIT ?",
+                        params + [chunk_size],
+                    )]
+                    if not ids:
+                        conn.rollback()
+                        break
+
+                    total += _archive_batch(conn, ids)
+                    conn.commit()
+
+                except Exception:
+                    conn.rollback()
+                    raise
+
+            if total:
+                archived[site] = total
+                print(f"[Retention] Archived {total} {site} jobs to {ARCHIVE_DIR}")
+
+        return archived
+
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def compact_db(conn=None):
+    """
+    Returns pages freed by archiving to the filesystem, merges the full-text
+    index and refreshes the query planner's statistics. The first run on a
+    database created without incremental auto-vacuum does a full VACUUM.
+    """
+    own_conn = conn is None
+    conn = conn or init_db()
+    size_before = os.path.getsize(DB_PATH)
+
+    try:
+        with conn:
+            conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            print("[Retention] Switching jobs.db to incremental auto-vacuum (full VACUUM)")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            # Frees one page per step, so it has to be read to the end.
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    finally:
+        if own_conn:
+            conn.close()
+
+    size_after = os.path.getsize(DB_PATH)
+    print(f"[Retention] jobs.db {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+
+
+def compact_csv(path=CSV_PATH):
+    """
+    Rewrites the CSV log keeping only the first row for each job_url (whole
+    rows are compared when there is no URL). Rows appended while it reads
+    are included, but it should run while no scrape is writing. Returns
+    (rows read, rows kept).
+    """
+    if not os.path.exists(path):
+        return 0, 0
+
+    tmp_path = path + ".compact"
+    seen = set()
+    read = 0
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return 0, 0
+        url_index = header.index("job_url") if "job_url" in header else None
+
+        with CsvSink(tmp_path, header, mode="w") as sink:
+            while True:
+                size = os.path.getsize(path)
+                for row in reader:
+                    read += 1
+                    url = row[url_index] if url_index is not None and url_index < len(row) else ""
+                    key = hashlib.blake2b(
+                        (url or "\x1f".join(row)).encode("utf-8"), digest_size=8
+                    ).digest()
+                    if key not in seen:
+                        seen.add(key)
+                        sink.write_rows([row])
+
+                if os.path.getsize(path) == size:
+                    break
+
+    os.replace(tmp_path, path)
+    print(f"[Retention] Compacted {path}: {read} rows -> {len(seen)}")
+    return read, len(seen)
+
+
+def _filter_expression(filters):
+    expr = None
+    for column, value in (filters or {}).items():
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        cond = ds.field(column).isin(values)
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def _archive_dataset():
+    if not os.path.isdir(ARCHIVE_DIR):
+        return None
+    return ds.dataset(ARCHIVE_DIR, format="parquet", partitioning=PARTITIONING)
+
+
+def load_archived_jobs(columns, filters=None):
+    """
+    Reads only `columns` of archived jobs into a DataFrame. `filters` maps a
+    column to a value or list of values, e.g. {"site": "Naukri", "month":
+    ["2023-01", "2023-02"]}; filters on site and month skip whole partitions
+    without opening their files.
+    """
+    dataset = _archive_dataset()
+    if dataset is None:
+        return pd.DataFrame(columns=list(columns))
+
+    table = dataset.to_table(columns=list(columns), filter=_filter_expression(filters))
+    return table.to_pandas()
+
+
+def iter_archived_jobs(columns, filters=None, batch_size=STREAM_BATCH_ROWS):
+    """
+    Like load_archived_jobs, but yields DataFrames of at most `batch_size`
+    rows, so memory use doesn't grow with the size of the archive.
+    """
+    dataset = _archive_dataset()
+    if dataset is None:
+        return
+
+    # A small readahead keeps only a few batches in memory at a time.
+    scanner = ds.Scanner.from_dataset(
+        dataset, columns=list(columns), filter=_filter_expression(filters),
+        batch_size=batch_size, batch_readahead=2, fragment_readahead=1,
+    )
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Archive expired jobs from jobs.db, then vacuum and analyze it."
+    )
+    parser.add_argument("--max-age-days", type=int, help="age limit for every site, in days")
+    parser.add_argument("--max-rows", type=int, help="jobs kept per site")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report how many jobs would be archived")
+    parser.add_argument("--compact-csv", action="store_true",
+                        help=f"also rewrite {CSV_PATH} without duplicate rows "
+                             "(run while no scrape is writing to it)")
+    args = parser.parse_args()
+
+    overrides = {
+        key: value for key, value in (
+            ("max_age_days", args.max_age_days),
+            ("max_rows", args.max_rows),
+        ) if value is not None
+    }
+
+    conn = init_db()
+    archived = archive_expired(conn, overrides, dry_run=args.dry_run)
+    if args.dry_run:
+        for site, n in archived.items():
+            print(f"{site}: {n} jobs would be archived")
+    else:
+        print(f"{sum(archived.values())} jobs archived to {ARCHIVE_DIR}")
+        compact_db(conn)
+        if args.compact_csv:
+            compact_csv()
+    conn.close()
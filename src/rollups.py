@@ -0,0 +1,211 @@
+import argparse
+from collections import Counter
+
+import pandas as pd
+
+from src.normalize import find_skills
+
+# Rollup dimension -> the jobs column it counts. "site" has a single value
+# per site ('') and gives the per-platform totals.
+ROLLUP_COLUMNS = {
+    "site": "''",
+    "company": "company",
+    "location": "location_clean",
+    "exp_bucket": "exp_bucket",
+}
+SKILL_DIMENSION = "skill"
+ROLLUP_DIMENSIONS = (*ROLLUP_COLUMNS, SKILL_DIMENSION)
+
+# Counts are kept per posting day (date_iso, '' when unknown) and as an
+# all-time total under ALL_DAYS, so the default dashboard reads one row per
+# value instead of summing every day. The site totals count every posting;
+# the other dimensions only the first posting of each near-duplicate cluster
+# (see dedup.py), so a job reposted on another site still counts there.
+ALL_DAYS = "*"
+DAY_SQL = "COALESCE(date_iso, '')"
+CANONICAL_SQL = "cluster_id = id"
+
+UPSERT_SQL = """
+    INSERT INTO job_rollups (dimension, site, day, value, jobs) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (dimension, site, day, value) DO UPDATE SET jobs = jobs + excluded.jobs
+"""
+
+
+def create_rollup_tables(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_rollups (
+            dimension TEXT NOT NULL,
+            site TEXT NOT NULL,
+            day TEXT NOT NULL,
+            value TEXT NOT NULL,
+            jobs INTEGER NOT NULL,
+            PRIMARY KEY (dimension, site, day, value)
+        ) WITHOUT ROWID
+    """)
+
+
+def job_skills(title, description):
+    return find_skills(" ".join(t for t in (title, description) if isinstance(t, str)))
+
+
+def _upsert_skills(conn, deltas):
+    conn.executemany(
+        UPSERT_SQL,
+        [
+            (SKILL_DIMENSION, site, day, skill, n)
+            for (site, day, skill), n in deltas.items() if n
+        ],
+    )
+
+
+def apply_rollups(conn, where, params=(), sign=1, sites=True):
+    """
+    Adds (sign=1) or removes (sign=-1) the counted jobs matching `where`, a
+    condition on the jobs table, in the caller's transaction. With
+    sites=False the site totals are left alone, for jobs already counted
+    there that have just become the first posting of their cluster.
+    """
+    for dimension, column in ROLLUP_COLUMNS.items():
+        if dimension == "site" and not sites:
+            continue
+        counted = "1" if dimension == "site" else CANONICAL_SQL
+        for day in (DAY_SQL, f"'{ALL_DAYS}'"):
+            conn.execute(
+                f"""
+                INSERT INTO job_rollups (dimension, site, day, value, jobs)
+                SELECT ?, COALESCE(site, ''), {day}, {column}, COUNT(*) * ?
+                FROM jobs
+                WHERE ({where}) AND {counted} AND {column} IS NOT NULL
+                GROUP BY 2, 3, 4
+                ON CONFLICT (dimension, site, day, value) DO UPDATE SET jobs = jobs + excluded.jobs
+                """,
+                (dimension, sign, *params),
+            )
+
+    deltas = Counter()
+    rows = conn.execute(
+        f"""
+        SELECT COALESCE(site, ''), {DAY_SQL}, title, description FROM jobs
+        WHERE ({where}) AND {CANONICAL_SQL}
+        """,
+        params,
+    )
+    for site, day, title, description in rows:
+        for skill in job_skills(title, description):
+            deltas[(site, day, skill)] += sign
+            deltas[(site, ALL_DAYS, skill)] += sign
+    _upsert_skills(conn, deltas)
+
+    if sign < 0:
+        conn.execute("DELETE FROM job_rollups WHERE jobs <= 0")
+
+
+def update_rollups(conn, after_id=0):
+    """
+    Adds the jobs with id > `after_id` to the rollups. insert_jobs calls it
+    with the highest id from before its inserts, inside its transaction.
+    """
+    apply_rollups(conn, "id > ?", (after_id,))
+
+
+def update_description_skills(conn, descriptions, chunk_size=500):
+    """
+    Moves the skill counts of counted jobs whose description is about to be
+    replaced ({job_url: new description}) from their old skills to the new
+    ones. Call in the same transaction as the UPDATE, before it.
+    """
+    deltas = Counter()
+    urls = list(descriptions)
+    for i in range(0, len(urls), chunk_size):
+        chunk = urls[i:i + chunk_size]
+        rows = conn.execute(
+            f"""
+            SELECT job_url, COALESCE(site, ''), {DAY_SQL}, title, description FROM jobs
+            WHERE job_url IN ({','.join('?' * len(chunk))}) AND {CANONICAL_SQL}
+            """,
+            chunk,
+        )
+        for url, site, day, title, old_description in rows:
+            before = job_skills(title, old_description)
+            after = job_skills(title, descriptions[url])
+            for skill in after - before:
+                deltas[(site, day, skill)] += 1
+                deltas[(site, ALL_DAYS, skill)] += 1
+            for skill in before - after:
+                deltas[(site, day, skill)] -= 1
+                deltas[(site, ALL_DAYS, skill)] -= 1
+
+    _upsert_skills(conn, deltas)
+    conn.execute("DELETE FROM job_rollups WHERE dimension = ? AND jobs <= 0", (SKILL_DIMENSION,))
+
+
+def rebuild_rollups(conn):
+    """
+    Recomputes every rollup from the jobs table, in the caller's transaction.
+    """
+    conn.execute("DELETE FROM job_rollups")
+    update_rollups(conn, after_id=0)
+
+
+def load_rollup(conn, dimension, sites=None, since=None, limit=None, exclude=()):
+    """
+    Returns a Series of job counts per value of `dimension` (per site for
+    "site"), largest first. `sites` limits the platforms and `since` (an ISO
+    date) the posting days; jobs without a posting date only appear in the
+    all-time counts.
+    """
+    if dimension not in ROLLUP_DIMENSIONS:
+        raise ValueError(f"Unknown rollup dimension '{dimension}'")
+
+    key = "site" if dimension == "site" else "value"
+    query = f"SELECT {key}, SUM(jobs) AS n FROM job_rollups WHERE dimension = ?"
+    params = [dimension]
+
+    if since:
+        query += " AND day >= ? AND day != ?"
+        params += [since, ALL_DAYS]
+    else:
+        query += " AND day = ?"
+        params.append(ALL_DAYS)
+    if sites:
+        query += f" AND site IN ({', '.join('?' * len(sites))})"
+        params += list(sites)
+    if exclude:
+        query += f" AND value NOT IN ({', '.join('?' * len(exclude))})"
+        params += list(exclude)
+
+    query += f" GROUP BY {key} ORDER BY n DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    rows = conn.execute(query, params).fetchall()
+    return pd.Series(
+        [n for _, n in rows], index=[value for value, _ in rows], name="count", dtype="int64"
+    )
+
+
+def count_rollup_values(conn, dimension, sites=None):
+    """
+    Number of distinct values of `dimension` across `sites`, all time.
+    """
+    query = "SELECT COUNT(DISTINCT value) FROM job_rollups WHERE dimension = ? AND day = ?"
+    params = [dimension, ALL_DAYS]
+    if sites:
+        query += f" AND site IN ({', '.join('?' * len(sites))})"
+        params += list(sites)
+    return conn.execute(query, params).fetchone()[0]
+
+
+if __name__ == "__main__":
+    from src.database import init_db
+
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard rollup tables in jobs.db.")
+    parser.parse_args()
+
+    conn = init_db()
+    with conn:
+        rebuild_rollups(conn)
+    n = conn.execute("SELECT COUNT(*) FROM job_rollups").fetchone()[0]
+    conn.close()
+    print(f"Rebuilt rollups: {n} rows")
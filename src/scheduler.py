@@ -0,0 +1,213 @@
+import re
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from src.database import init_db
+from src.job_queue import (
+    ACTIVE_STATUSES,
+    add_schedule,
+    count_active_scrape_jobs,
+    enqueue_scrape_job,
+    get_scrape_job,
+    list_schedules,
+)
+
+MAX_CONCURRENT_JOBS = 3
+TICK_SECONDS = 30
+
+# Timestamps are stored the way SQLite's datetime('now') writes them (UTC),
+# so they compare correctly against the scrape_jobs columns.
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+}
+
+_EVERY_RE = re.compile(r"^@every\s+(\d+)\s*([mh])$")
+
+# minute, hour, day of month, month, day of week (0 = Sunday)
+CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+def utcnow():
+    # Naive, like the stored TS_FORMAT timestamps it is compared with.
+    return datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
+
+
+def _parse_cron_field(field, lo, hi):
+    values = set()
+
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-"))
+        else:
+            start = end = int(part)
+
+        if start < lo or end > hi or start > end or step < 1:
+            raise ValueError(f"Cron field '{field}' out of range {lo}-{hi}")
+
+        values.update(range(start, end + 1, step))
+
+    return values
+
+
+def parse_cron(expr):
+    """
+    Parses a 5-field cron expression (with *, lists, ranges and steps), one
+    of the @hourly/@daily/@weekly aliases, or `@every <n>m|h`. Returns either
+    a list of allowed-value sets or a timedelta for fixed intervals.
+    """
+    expr = CRON_ALIASES.get(expr.strip(), expr.strip())
+
+    every = _EVERY_RE.match(expr)
+    if every:
+        n, unit = int(every.group(1)), every.group(2)
+        return timedelta(minutes=n) if unit == "m" else timedelta(hours=n)
+
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"Expected 5 cron fields, got '{expr}'")
+
+    return [_parse_cron_field(f, lo, hi) for f, (lo, hi) in zip(fields, CRON_RANGES)]
+
+
+def next_run_time(expr, after):
+    spec = parse_cron(expr)
+    if isinstance(spec, timedelta):
+        return after + spec
+
+    minutes, hours, days, months, weekdays = spec
+    # As in cron, when both day fields are restricted a day matching either
+    # one fires ("0 0 1 * 1" = the 1st of the month and every Monday).
+    either_day = (
+        days != _parse_cron_field("*", *CRON_RANGES[2])
+        and weekdays != _parse_cron_field("*", *CRON_RANGES[4])
+    )
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = after + timedelta(days=366)
+
+    while t <= limit:
+        weekday = (t.weekday() + 1) % 7
+        if either_day:
+            day_ok = t.day in days or weekday in weekdays
+        else:
+            day_ok = t.day in days and weekday in weekdays
+        if t.month not in months or not day_ok:
+            t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+        if t.hour not in hours:
+            t = (t + timedelta(hours=1)).replace(minute=0)
+            continue
+        if t.minute not in minutes:
+            t += timedelta(minutes=1)
+            continue
+        return t
+
+    raise ValueError(f"Cron expression '{expr}' never fires")
+
+
+def _jittered_next_run(schedule, now):
+    base = next_run_time(schedule["cron"], now)
+    return base + timedelta(seconds=random.uniform(0, schedule["jitter_seconds"]))
+
+
+def _set_next_run(conn, schedule_id, next_run, last_job_id=None):
+    with conn:
+        conn.execute(
+            """
+            UPDATE scrape_schedules
+            SET next_run_at = ?, last_job_id = COALESCE(?, last_job_id)
+            WHERE id = ?
+            """,
+            (next_run.strftime(TS_FORMAT), last_job_id, schedule_id),
+        )
+
+
+def tick(conn, max_concurrent=MAX_CONCURRENT_JOBS):
+    """
+    Enqueues every due schedule, unless its previous run is still in flight
+    (that run is skipped) or the global cap on queued/running jobs is hit
+    (it stays due and is retried next tick). Returns the enqueued job ids.
+    """
+    now = utcnow()
+    now_str = now.strftime(TS_FORMAT)
+    active = count_active_scrape_jobs(conn)
+    enqueued = []
+
+    due = [
+        s for s in list_schedules(conn, enabled_only=True)
+        if s["next_run_at"] is None or s["next_run_at"] <= now_str
+    ]
+    due.sort(key=lambda s: s["next_run_at"] or "")
+
+    for schedule in due:
+        if schedule["next_run_at"] is None:
+            # New schedule: spread its first run over the jitter window.
+            _set_next_run(conn, schedule["id"], _jittered_next_run(schedule, now))
+            continue
+
+        last = get_scrape_job(conn, schedule["last_job_id"]) if schedule["last_job_id"] else None
+        if last and last["status"] in ACTIVE_STATUSES:
+            print(f"[Scheduler] '{schedule['name']}' still running (job {last['id']}), skipping")
+            _set_next_run(conn, schedule["id"], _jittered_next_run(schedule, now))
+            continue
+
+        if active >= max_concurrent:
+            print(f"[Scheduler] {active} jobs in flight, deferring '{schedule['name']}'")
+            continue
+
+        job_id = enqueue_scrape_job(
+            conn, schedule["kind"], schedule["params"], schedule_id=schedule["id"]
+        )
+        active += 1
+        enqueued.append(job_id)
+
+        next_run = _jittered_next_run(schedule, now)
+        _set_next_run(conn, schedule["id"], next_run, job_id)
+        print(f"[Scheduler] Enqueued '{schedule['name']}' as job {job_id}, next at {next_run}")
+
+    return enqueued
+
+
+def create_schedule(conn, name, kind, params, cron, jitter_seconds=300):
+    parse_cron(cron)
+    return add_schedule(conn, name, kind, params, cron, jitter_seconds)
+
+
+def run_forever(max_concurrent=MAX_CONCURRENT_JOBS, tick_seconds=TICK_SECONDS):
+    conn = init_db()
+    print(f"[Scheduler] Started (max {max_concurrent} concurrent jobs)")
+
+    try:
+        while True:
+            try:
+                tick(conn, max_concurrent)
+            except Exception as e:
+                print(f"[Scheduler] Tick failed: {e}")
+            time.sleep(tick_seconds)
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enqueue saved scrape schedules when due.")
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT_JOBS)
+    parser.add_argument("--tick", type=float, default=TICK_SECONDS)
+    args = parser.parse_args()
+
+    run_forever(args.max_concurrent, args.tick)
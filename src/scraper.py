@@ -1,66 +1,28 @@
-import time
-import random
 import shutil
 import asyncio
+import math
 import re
+import threading
 from datetime import datetime, timedelta
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import undetected_chromedriver as uc
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-
-def bucket_exp(x):
-    x = x.lower().strip()
-
-    if x in ["n/a", "", "not disclosed", "unknown"]:
-        return "Unknown"
-
-    if "fresher" in x:
-        return "0-1 years"
-
-    nums = re.findall(r'\d+', x)
-
-    if len(nums) == 0:
-        return "Unknown"
-
-    nums = [int(n) for n in nums]
-    low = nums[0]
-    high = nums[1] if len(nums) > 1 else nums[0]
-
-    if high <= 1:
-        return "0-1 years"
-    elif high <= 3:
-        return "1-3 years"
-    elif high <= 5:
-        return "3-5 years"
-    elif high <= 10:
-        return "5-10 years"
-    else:
-        return "10+ years"
-
-def normalize_private_exp(x):
-
-    x = x.lower().strip()
-
-    if x in ["n/a", "", "not disclosed"]:
-        return "Unknown"
-
-    if "fresher" in x:
-        return "0 years"
-
-    nums = re.findall(r'\d+', x)
-
-    if len(nums) == 0:
-        return "Unknown"
-
-    elif len(nums) == 1:
-        return f"{nums[0]} years"
-    
-    else:
-        return f"{nums[0]}-{nums[1]} years"
-
+from src.normalize import clean_location
+from src.driver_pool import get_driver_pool
+from src.http_client import make_session, fetch_text, FetchBlocked
+from src.replay import record_page
+from src.rate_limiter import get_rate_limiter, looks_blocked, domain_of
+from src.tracing import span
+from src.checkpoints import ScrapeCheckpoint
+from src.card_parser import (
+    SITE_SPECS,
+    BATCH_EXTRACT_JS,
+    parse_cards,
+    extract_fields_soup,
+    apply_defaults,
+)
 
 def parse_relative_date(text):
     if not text:
@@ -118,15 +80,283 @@ INDEED_FILTERS = {
 }
 
 
+# Lean mode: resources the scrapers never read. Playwright aborts requests by
+# resource type or third-party domain; Chrome disables images via prefs and
+# blocks the URL patterns below over CDP.
+LEAN_BLOCKED_RESOURCE_TYPES = ["image", "media", "font", "stylesheet"]
+
+LEAN_BLOCKED_DOMAINS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "scorecardresearch.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "taboola.com",
+    "outbrain.com",
+    "px.ads.linkedin.com",
+]
+
+LEAN_CHROME_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+] + [f"*{d}*" for d in LEAN_BLOCKED_DOMAINS]
+
+# Rough per-request sizes used to estimate what blocked requests would have
+# cost; the browser never sees their real size.
+LEAN_EST_BYTES = {
+    "image": 40_000,
+    "media": 250_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "script": 60_000,
+}
+LEAN_EST_BYTES_DEFAULT = 10_000
+
+# JS run after each page is ready in lean Chrome: what the page actually
+# loaded, and how many images were skipped.
+PAGE_WEIGHT_JS = """
+const entries = performance.getEntriesByType('resource');
+let bytes = 0;
+for (const e of entries) bytes += e.transferSize || 0;
+const nav = performance.getEntriesByType('navigation')[0];
+if (nav) bytes += nav.transferSize || 0;
+return [entries.length + 1, bytes, document.images.length];
+"""
+
+
+# undetected_chromedriver patches a shared chromedriver binary on startup, so
+# concurrent launches from the orchestrator's worker threads must not overlap.
+_DRIVER_LAUNCH_LOCK = threading.Lock()
+
+
+def extract_fields_element(card, spec, only=None):
+    fields = {}
+
+    for name, field in spec["fields"].items():
+        if only is not None and name not in only:
+            continue
+
+        css = field.get("css")
+
+        if field.get("all"):
+            matches = card.find_elements(By.CSS_SELECTOR, css) if css else [card]
+            fields[name] = [m.text for m in matches]
+            continue
+
+        try:
+            el = card.find_element(By.CSS_SELECTOR, css) if css else card
+            if field.get("attr"):
+                value = el.get_attribute(field["attr"])
+                if not value and field.get("fallback_text"):
+                    value = el.text
+            else:
+                value = el.text
+
+        except Exception:
+            if "default" not in field:
+                raise
+            value = None
+
+        fields[name] = value if value is not None else field.get("default")
+
+    return fields
+
+
+def build_indeed_job(f):
+    salary = "Not Disclosed"
+    for txt in f["metadata"]:
+        if "₹" in txt or "year" in txt or "month" in txt:
+            salary = txt
+            break
+
+    return {
+        "title": f["title"],
+        "company": f["company"],
+        "location": f["location"],
+        "salary": salary,
+        "experience": "N/A",
+        "description": f"{f['title']} {f['company']} {f['location']}",
+        "job_url": f["link"],
+        "site": "Indeed",
+        "date_posted": parse_relative_date(f["date_text"]),
+    }
+
+
+def build_naukri_job(f):
+    return {
+        "title": f["title"],
+        "company": f["company"],
+        "location": f["location"],
+        "salary": f["salary"],
+        "experience": f["experience"],
+        "description": f"{f['title']} {f['company']} {f['location']}",
+        "job_url": f["link"],
+        "site": "Naukri",
+        "date_posted": parse_relative_date(f["date_text"]),
+    }
+
+
+def build_jobkaka_job(f, query=None):
+    title = f["title"].strip()
+    details = [d.strip() for d in f["details"]]
+
+    state = clean_location(title)
+    if query and state == "Unknown":
+        state = query.capitalize()
+
+    return {
+        "title": title,
+        "company": details[1] if len(details) > 1 else "N/A",
+        "location": state,
+        "salary": details[3] if len(details) > 3 else "Not Disclosed",
+        "experience": details[2] if len(details) > 2 else "N/A",
+        "description": title,
+        "job_url": f["link"],
+        "site": "JobKaka",
+        "date_posted": details[0] if len(details) > 0 else "N/A",
+    }
+
+
+PAGE_READY_TIMEOUT = 15
+
+
+def jobkaka_url(page, query=None):
+    if query:
+        return f"https://www.jobkaka.com/page/{page}/?s={query}"
+    return f"https://www.jobkaka.com/page/{page}/"
+
+
+def indeed_url(keyword, page, time_filter="Any Time"):
+    time_param = INDEED_FILTERS.get(time_filter, "")
+    return f"https://in.indeed.com/jobs?q={keyword}&l=India{time_param}&start={page * 10}"
+
+
+def naukri_url(keyword, page):
+    return f"https://www.naukri.com/{keyword.replace(' ', '-')}-jobs-{page}"
+
+
+# How batch scrapes page through each Selenium site's search results.
+BATCH_SEARCHES = {
+    "Indeed": {
+        "first_page": 0,
+        "url": lambda query, page, time_filter: indeed_url(query["keyword"], page, time_filter),
+    },
+    "Naukri": {
+        "first_page": 1,
+        "url": lambda query, page, time_filter: naukri_url(query["keyword"], page),
+    },
+}
+
+
 class SeleniumScraper:
-    def __init__(self):
+    def __init__(self, use_pool=True, parse_mode="snapshot", limiter=None, lean=False,
+                 record=False, known_urls=None, resume=False):
         self.driver = None
+        self.resume = resume
+        self.known_urls = known_urls
+        self.record = record
+        self.use_pool = use_pool
+        self.parse_mode = parse_mode
+        self.limiter = limiter or get_rate_limiter()
+        self.throttled = 0.0
+        self.lean = lean
+
+    def _report_page_weight(self, url):
+        try:
+            requests, loaded, images = self.driver.execute_script(PAGE_WEIGHT_JS)
+        except Exception:
+            return
+
+        saved = images * LEAN_EST_BYTES["image"]
+        print(
+            f"[Lean] {domain_of(url)}: loaded {requests} requests / {loaded // 1024} KB, "
+            f"skipped {images} images (~{saved // 1024} KB est. saved)"
+        )
+
+    def _load_page(self, site, url, page=None):
+        """
+        Navigates once the domain's rate limiter allows it and returns as
+        soon as the cards (or a block page) are present.
+        """
+        with span("throttle", site=site, page=page) as s:
+            s["waited"] = self.limiter.acquire(url)
+            self.throttled += s["waited"]
+
+        with span("page.load", site=site, page=page) as s:
+            s["state"] = self._navigate(url, SITE_SPECS[site]["card"])
+
+        if self.lean:
+            self._report_page_weight(url)
+
+    def _navigate(self, url, ready_selector):
+        self.driver.get(url)
+
+        def ready(driver):
+            if driver.find_elements(By.CSS_SELECTOR, ready_selector):
+                return "ready"
+            if looks_blocked(driver.title, driver.current_url):
+                return "blocked"
+            return False
+
+        try:
+            state = WebDriverWait(self.driver, PAGE_READY_TIMEOUT).until(ready)
+        except Exception:
+            state = "blocked" if looks_blocked(self.driver.title) else "timeout"
+            if state == "timeout":
+                raise
+
+        if state == "blocked":
+            self.limiter.report_blocked(url)
+            raise RuntimeError(f"Blocked at {self.driver.current_url}")
+
+        self.limiter.report_ok(url)
+        return state
+
+    def _acquire_driver(self, headless=False):
+        with span("driver.acquire", pooled=self.use_pool, headless=headless):
+            if self.use_pool:
+                self.driver = get_driver_pool(self.get_driver).acquire(headless, self.lean)
+            else:
+                self.driver = self.get_driver(headless=headless, lean=self.lean)
+        return self.driver
+
+    def _release_driver(self, broken=False):
+        driver, self.driver = self.driver, None
+        if driver is None:
+            return
 
-    def get_driver(self, headless=False):
+        if self.use_pool:
+            get_driver_pool().release(driver, broken=broken)
+            return
+
+        try:
+            driver.quit()
+        except:
+            pass
+
+    def get_driver(self, headless=False, lean=False):
         options = uc.ChromeOptions()
         if headless:
             options.add_argument("--headless=new")
 
+        if lean:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument("--disable-remote-fonts")
+            options.add_experimental_option(
+                "prefs",
+                {
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.managed_default_content_settings.media_stream": 2,
+                    "profile.default_content_setting_values.notifications": 2,
+                },
+            )
+
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-blink-features=AutomationControlled")
@@ -143,15 +373,25 @@ class SeleniumScraper:
         )
 
         try:
-            if browser_path:
-                driver = uc.Chrome(
-                    options=options,
-                    browser_executable_path=browser_path,
-                    use_subprocess=True,
-                )
+            with _DRIVER_LAUNCH_LOCK:
+                if browser_path:
+                    driver = uc.Chrome(
+                        options=options,
+                        browser_executable_path=browser_path,
+                        use_subprocess=True,
+                    )
 
-            else:
-                driver = uc.Chrome(options=options, use_subprocess=True)
+                else:
+                    driver = uc.Chrome(options=options, use_subprocess=True)
+
+            if lean:
+                try:
+                    driver.execute_cdp_cmd("Network.enable", {})
+                    driver.execute_cdp_cmd(
+                        "Network.setBlockedURLs", {"urls": LEAN_CHROME_BLOCKED_URLS}
+                    )
+                except Exception as e:
+                    print(f"Could not set blocked URLs: {e}")
 
             return driver
         
@@ -159,251 +399,313 @@ class SeleniumScraper:
             print(f"Error creating driver: {e}")
             raise
 
+    def _page_cards(self, site, page_url, page=None):
+        """
+        Returns the cards on the loaded page and the function that extracts
+        their fields. Snapshot mode parses one `page_source` offline; live
+        element lookups are the fallback.
+        """
+        with span("page.parse", site=site, page=page, mode=self.parse_mode) as s:
+            cards, extract = self._find_cards(site, page_url)
+            s["cards"] = len(cards)
+        return cards, extract
+
+    def _find_cards(self, site, page_url):
+        spec = SITE_SPECS[site]
+        html = None
+
+        if self.record or self.parse_mode == "snapshot":
+            html = self.driver.page_source
+
+        if self.record:
+            record_page(site, html, page_url)
+
+        if self.parse_mode == "snapshot":
+            try:
+                cards = parse_cards(html, spec)
+                if cards:
+                    return cards, lambda card, only=None: extract_fields_soup(
+                        card, spec, page_url, only
+                    )
+                print(f"[{site}] Snapshot found no cards, using live elements")
+
+            except Exception as e:
+                print(f"[{site}] Snapshot parse failed ({e}), using live elements")
+
+        cards = self.driver.find_elements(By.CSS_SELECTOR, spec["card"])
+        return cards, lambda card, only=None: extract_fields_element(
+            card, spec, only
+        )
+
+    def _collect_cards(self, site, cards, extract, build, jobs, limit, page=None):
+        """
+        Builds jobs from a page's cards until `limit` is reached. In
+        incremental mode a card's link is read first and known cards are
+        skipped without extracting anything else. Returns the number of
+        known cards seen.
+        """
+        known = 0
+
+        for i, card in enumerate(cards):
+            if len(jobs) >= limit:
+                break
+
+            with span("card.extract", site=site, page=page, card=i) as s:
+                try:
+                    if self.known_urls is not None:
+                        link = extract(card, only=("link",))["link"]
+                        if link in self.known_urls:
+                            known += 1
+                            s["known"] = True
+                            continue
+
+                    job = build(extract(card))
+                    jobs.append(job)
+
+                    print(f"[{site}] Scraped: {job['title']} at {job['company']}")
+
+                except Exception as e:
+                    s["error"] = str(e)
+                    print(f"[{site}] Error parsing job: {e}")
+
+        return known
+
+    def _open_checkpoint(self, site, filters, first_page):
+        """
+        Returns (checkpoint, page, jobs); with resume off there is no
+        checkpoint and the scrape starts from `first_page`.
+        """
+        if not self.resume:
+            return None, first_page, []
+
+        checkpoint = ScrapeCheckpoint(site, filters)
+        return (checkpoint, *checkpoint.load(first_page))
+
+    def _close_checkpoint(self, checkpoint, completed):
+        if checkpoint is None:
+            return
+
+        try:
+            if completed:
+                checkpoint.clear()
+        finally:
+            checkpoint.close()
+
+    def _page_mostly_known(self, site, known, cards):
+        if self.known_urls is None or not self.known_urls.is_mostly_known(known, len(cards)):
+            return False
+
+        print(f"[{site}] {known}/{len(cards)} cards already known, stopping")
+        return True
+
     def scrape_indeed(self, keyword, limit=10, time_filter="Any Time"):
         print(f"[Indeed] Scraping '{keyword}' (limit={limit})")
-        jobs = []
-        time_param = INDEED_FILTERS.get(time_filter, "")
-        page = 0
+        self.throttled = 0.0
+        broken = False
+        completed = False
+        checkpoint, page, jobs = self._open_checkpoint(
+            "Indeed", {"keyword": keyword, "time_filter": time_filter}, 0
+        )
 
         try:
-            self.driver = self.get_driver(headless=False)
+            self._acquire_driver(headless=False)
 
             while len(jobs) < limit:
-                url = f"https://in.indeed.com/jobs?q={keyword}&l=India{time_param}&start={page * 10}"
+                url = indeed_url(keyword, page, time_filter)
                 print(f"[Indeed] Fetching page {page + 1}: {url}")
 
                 try:
-                    self.driver.get(url)
-                    time.sleep(random.uniform(5, 8))
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "div.job_seen_beacon")
-                        )
-                    )
+                    self._load_page("Indeed", url, page)
+
+                except TimeoutException:
+                    # Loaded but neither cards nor a block page appeared:
+                    # past the last page of results.
+                    print("[Indeed] No job cards found")
+                    completed = True
+                    break
 
                 except Exception as e:
                     print(f"[Indeed] Error loading page: {e}")
                     break
 
-                cards = self.driver.find_elements(
-                    By.CSS_SELECTOR, "div.job_seen_beacon"
-                )
+                cards, extract = self._page_cards("Indeed", url, page)
 
                 if not cards:
                     print("[Indeed] No job cards found")
+                    completed = True
                     break
 
                 print(f"[Indeed] Found {len(cards)} job cards")
 
-                for card in cards:
-                    if len(jobs) >= limit:
-                        break
-
-                    try:
-                        title = card.find_element(By.CSS_SELECTOR, "h2 span").text
-
-                        company = card.find_element(
-                            By.CSS_SELECTOR, "span[data-testid='company-name']"
-                        ).text
-
-                        loc = card.find_element(
-                            By.CSS_SELECTOR, "div[data-testid='text-location']"
-                        ).text
-
-                        salary = "Not Disclosed"
-                        try:
-                            meta_items = card.find_elements(
-                                By.CSS_SELECTOR, ".metadata"
-                            )
-
-                            for m in meta_items:
-                                txt = m.text
-                                if "₹" in txt or "year" in txt or "month" in txt:
-                                    salary = txt
-                                    break
-
-                        except:
-                            pass
-
-                        try:
-                            date_text = card.find_element(
-                                By.CSS_SELECTOR, "span.date"
-                            ).text
-
-                        except:
-                            date_text = "Today"
-
-                        try:
-                            link = card.find_element(
-                                By.CSS_SELECTOR, "a"
-                            ).get_attribute("href")
-
-                        except:
-                            link = "#"
-
-                        jobs.append(
-                            {
-                                "title": title,
-                                "company": company,
-                                "location": loc,
-                                "salary": salary,
-                                "experience": "N/A",
-                                "description": f"{title} {company} {loc}",
-                                "job_url": link,
-                                "site": "Indeed",
-                                "date_posted": parse_relative_date(date_text),
-                            }
-                        )
-
-                        print(f"[Indeed] Scraped: {title} at {company}")
+                known = self._collect_cards(
+                    "Indeed", cards, extract, build_indeed_job, jobs, limit, page
+                )
 
-                    except Exception as e:
-                        print(f"[Indeed] Error parsing job: {e}")
+                page += 1
+                if checkpoint:
+                    checkpoint.save(page, jobs)
 
-                if len(jobs) >= limit:
+                if len(jobs) >= limit or self._page_mostly_known("Indeed", known, cards):
+                    completed = True
                     break
 
-                page += 1
-                time.sleep(random.uniform(3, 5))
+            else:
+                completed = True
 
         except Exception as e:
             print(f"[Indeed] Fatal error: {e}")
+            broken = True
 
         finally:
-            try:
-                self.driver.quit()
-            except:
-                pass
+            self._release_driver(broken)
+            self._close_checkpoint(checkpoint, completed)
 
         print(f"[Indeed] Total scraped: {len(jobs)}")
-        return jobs
+        print(f"[Indeed] Time spent throttling: {self.throttled:.1f}s")
+        return jobs[:limit]
 
     def scrape_naukri(self, keyword, location, limit=10):
         print(f"[Naukri] Scraping '{keyword}' (limit={limit})")
-        jobs = []
-        page = 1
+        self.throttled = 0.0
+        broken = False
+        completed = False
+        checkpoint, page, jobs = self._open_checkpoint(
+            "Naukri", {"keyword": keyword, "location": location}, 1
+        )
 
         try:
-            self.driver = self.get_driver(headless=False)
+            self._acquire_driver(headless=False)
 
             while len(jobs) < limit:
-                url = (
-                    f"https://www.naukri.com/{keyword.replace(' ', '-')}-jobs-{page}"
-                )
+                url = naukri_url(keyword, page)
                 print(f"[Naukri] Fetching page {page}: {url}")
 
                 try:
-                    self.driver.get(url)
-                    time.sleep(random.uniform(5, 8))
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, ".srp-jobtuple-wrapper")
-                        )
-                    )
+                    self._load_page("Naukri", url, page)
+
+                except TimeoutException:
+                    # Loaded but neither cards nor a block page appeared:
+                    # past the last page of results.
+                    print("[Naukri] No job cards found")
+                    completed = True
+                    break
 
                 except Exception as e:
                     print(f"[Naukri] Error loading page: {e}")
                     break
 
-                cards = self.driver.find_elements(
-                    By.CSS_SELECTOR, ".srp-jobtuple-wrapper"
-                )
+                cards, extract = self._page_cards("Naukri", url, page)
 
                 if not cards:
                     print("[Naukri] No job cards found")
+                    completed = True
                     break
 
                 print(f"[Naukri] Found {len(cards)} job cards")
 
-                for card in cards:
-                    if len(jobs) >= limit:
-                        break
-
-                    try:
-                        title = card.find_element(
-                            By.CSS_SELECTOR, ".title"
-                        ).text
-
-                        company = card.find_element(
-                            By.CSS_SELECTOR, ".comp-name"
-                        ).text
-
-                        loc = card.find_element(
-                            By.CSS_SELECTOR, ".locWdth"
-                        ).text
-
-                        try:
-                            exp = card.find_element(
-                                By.CSS_SELECTOR, ".expwdth"
-                            ).text
-
-                        except:
-                            exp = "N/A"
-
-
-                        try:
-                            sal = card.find_element(
-                                By.CSS_SELECTOR, ".sal-wrap"
-                            ).text
-
-                        except:
-                            sal = "Not Disclosed"
-
+                known = self._collect_cards(
+                    "Naukri", cards, extract, build_naukri_job, jobs, limit, page
+                )
 
-                        try:
-                            date_text = card.find_element(
-                                By.CSS_SELECTOR, ".job-post-day"
-                            ).text
+                page += 1
+                if checkpoint:
+                    checkpoint.save(page, jobs)
 
-                        except:
-                            date_text = "Today"
+                if len(jobs) >= limit or self._page_mostly_known("Naukri", known, cards):
+                    completed = True
+                    break
 
+            else:
+                completed = True
 
-                        try:
-                            link = card.find_element(
-                                By.CSS_SELECTOR, ".title"
-                            ).get_attribute("href")
+        except Exception as e:
+            print(f"[Naukri] Fatal error: {e}")
+            broken = True
 
-                        except:
-                            link = "#"
+        finally:
+            self._release_driver(broken)
+            self._close_checkpoint(checkpoint, completed)
 
+        print(f"[Naukri] Total scraped: {len(jobs)}")
+        print(f"[Naukri] Time spent throttling: {self.throttled:.1f}s")
+        return jobs[:limit]
+
+    def scrape_batch(self, site, queries, limit=10, time_filter="Any Time"):
+        """
+        Scrapes several queries ({"keyword", "location"} dicts) on one site
+        over a single warm driver, taking one page per query in turn so the
+        domain's rate limiter spaces the requests. `limit` applies per query.
+        Each job is tagged with the keyword that first found it; postings
+        found again by another query are dropped.
+        """
+        search = BATCH_SEARCHES[site]
+        build = JOB_BUILDERS[site]
+        print(f"[{site}] Batch scraping {len(queries)} queries (limit={limit} each)")
+
+        self.throttled = 0.0
+        broken = False
+        seen = set()
+        duplicates = 0
+        states = [
+            {"query": q, "page": search["first_page"], "jobs": []} for q in queries
+        ]
+        active = list(states)
 
-                        jobs.append(
-                            {
-                                "title": title,
-                                "company": company,
-                                "location": loc,
-                                "salary": sal,
-                                "experience": exp,
-                                "description": f"{title} {company} {loc}",
-                                "job_url": link,
-                                "site": "Naukri",
-                                "date_posted": parse_relative_date(date_text),
-                            }
-                        )
+        try:
+            self._acquire_driver(headless=False)
 
-                        print(f"[Naukri] Scraped: {title} at {company}")
+            while active:
+                for state in list(active):
+                    keyword = state["query"]["keyword"]
+                    url = search["url"](state["query"], state["page"], time_filter)
+                    print(f"[{site}] '{keyword}' page {state['page']}: {url}")
 
+                    try:
+                        self._load_page(site, url, state["page"])
                     except Exception as e:
-                        print(f"[Naukri] Error parsing job: {e}")
+                        print(f"[{site}] Error loading page for '{keyword}': {e}")
+                        active.remove(state)
+                        continue
+
+                    cards, extract = self._page_cards(site, url, state["page"])
+                    page_jobs = []
+                    known = self._collect_cards(
+                        site, cards, extract, build, page_jobs,
+                        limit - len(state["jobs"]), state["page"]
+                    )
 
-                if len(jobs) >= limit:
-                    break
-
-                page += 1
-                time.sleep(random.uniform(3, 5))
+                    new = 0
+                    for job in page_jobs:
+                        if job["job_url"] in seen:
+                            duplicates += 1
+                            continue
+                        seen.add(job["job_url"])
+                        job["query"] = keyword
+                        state["jobs"].append(job)
+                        new += 1
+
+                    state["page"] += 1
+                    if (
+                        not cards
+                        or len(state["jobs"]) >= limit
+                        or self._page_mostly_known(site, known, cards)
+                        or (page_jobs and not new)
+                    ):
+                        active.remove(state)
 
         except Exception as e:
-            print(f"[Naukri] Fatal error: {e}")
+            print(f"[{site}] Fatal error: {e}")
+            broken = True
 
         finally:
-            try:
-                self.driver.quit()
-
-            except:
-                pass
+            self._release_driver(broken)
 
-        print(f"[Naukri] Total scraped: {len(jobs)}")
+        jobs = [job for state in states for job in state["jobs"]]
+        print(
+            f"[{site}] Batch total: {len(jobs)} jobs for {len(queries)} queries, "
+            f"{duplicates} duplicates dropped"
+        )
+        print(f"[{site}] Time spent throttling: {self.throttled:.1f}s")
         return jobs
 
     def scrape_jobkaka(self, limit=30, query=None):
@@ -414,38 +716,26 @@ class SeleniumScraper:
             print(f"[JobKaka] Scraping Latest Jobs (Limit: {limit})")
 
         jobs = []
+        broken = False
         current_page = 1
+        self.throttled = 0.0
 
         try:
-            self.driver = self.get_driver(headless=True)
+            self._acquire_driver(headless=True)
 
             while len(jobs) < limit:
-                if query:
-                    url = (
-                        f"https://www.jobkaka.com/page/{current_page}/?s={query}"
-                    )
-
-                else:
-                    url = f"https://www.jobkaka.com/page/{current_page}/"
+                url = jobkaka_url(current_page, query)
 
                 print(f"[JobKaka] Page {current_page}: {url}")
 
                 try:
-                    self.driver.get(url)
-                    time.sleep(random.uniform(3, 5))
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "a.content_link")
-                        )
-                    )
+                    self._load_page("JobKaka", url, current_page)
 
                 except Exception as e:
                     print(f"[JobKaka] Error loading page: {e}")
                     break
 
-                job_cards = self.driver.find_elements(
-                    By.CSS_SELECTOR, "a.content_link"
-                )
+                job_cards, extract = self._page_cards("JobKaka", url, current_page)
 
                 if not job_cards:
                     print("[JobKaka] No more jobs found")
@@ -455,84 +745,258 @@ class SeleniumScraper:
                     f"[JobKaka] Found {len(job_cards)} job cards on page {current_page}"
                 )
 
-                for job in job_cards:
-                    if len(jobs) >= limit:
-                        break
-
-                    try:
-                        title = job.find_element(
-                            By.CSS_SELECTOR, ".entry-title"
-                        ).text.strip()
-
-                        details = job.find_elements(
-                            By.CSS_SELECTOR, ".entry-job-date-details"
-                        )
-
-                        updated_on = (
-                            details[0].text.strip() if len(details) > 0 else "N/A"
-                        )
-
-                        job_type = (
-                            details[1].text.strip() if len(details) > 1 else "N/A"
-                        )
-
-                        qualification = (
-                            details[2].text.strip() if len(details) > 2 else "N/A"
-                        )
-
-                        salary = (
-                            details[3].text.strip()
-                            if len(details) > 3
-                            else "Not Disclosed"
-                        )
-
-                        link = job.get_attribute("href")
-
-                        from src.analytics_engine import clean_location
-
-                        state = clean_location(title)
-                        if query and state == "Unknown":
-                            state = query.capitalize()
-
-                        jobs.append(
-                            {
-                                "title": title,
-                                "company": job_type,
-                                "location": state,
-                                "salary": salary,
-                                "experience": qualification,
-                                "description": title,
-                                "job_url": link,
-                                "site": "JobKaka",
-                                "date_posted": updated_on,
-                            }
-                        )
-
-                        print(f"[JobKaka] Scraped: {title}")
-
-                    except Exception as e:
-                        print(f"[JobKaka] Error parsing job: {e}")
+                known = self._collect_cards(
+                    "JobKaka", job_cards, extract,
+                    lambda f: build_jobkaka_job(f, query), jobs, limit, current_page
+                )
 
-                if len(jobs) >= limit:
+                if len(jobs) >= limit or self._page_mostly_known("JobKaka", known, job_cards):
                     break
 
                 current_page += 1
-                time.sleep(random.uniform(2, 4))
 
         except Exception as e:
             print(f"[JobKaka] Fatal error: {e}")
+            broken = True
 
         finally:
-            try:
-                self.driver.quit()
-            except:
-                pass
+            self._release_driver(broken)
 
         print(f"[JobKaka] Total scraped: {len(jobs)}")
+        print(f"[JobKaka] Time spent throttling: {self.throttled:.1f}s")
         return jobs
 
 
+def build_linkedin_job(f):
+    title = f["title"].strip()
+    link = f["link"]
+    if "?" in link:
+        link = link.split("?")[0]
+
+    return {
+        "title": title,
+        "company": f["company"].strip(),
+        "location": f["location"].strip(),
+        "salary": "Not Disclosed",
+        "experience": "N/A",
+        "description": title,
+        "job_url": link,
+        "site": "LinkedIn",
+        "date_posted": parse_relative_date(f["date_text"].strip()),
+    }
+
+
+JOB_BUILDERS = {
+    "Indeed": build_indeed_job,
+    "Naukri": build_naukri_job,
+    "LinkedIn": build_linkedin_job,
+    "JobKaka": build_jobkaka_job,
+}
+
+
+LINKEDIN_SHOW_MORE = "button.infinite-scroller__show-more-button"
+LINKEDIN_VIEWED_ALL = ".see-more-jobs__viewed-all"
+LINKEDIN_MAX_STALLS = 3
+LINKEDIN_BATCH_TABS = 3
+LINKEDIN_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/115.0.0.0 Safari/537.36"
+)
+
+
 class LinkedInScraper:
+    def __init__(self, limiter=None, lean=False, record=False, known_urls=None):
+        self.record = record
+        self.known_urls = known_urls
+        self.limiter = limiter or get_rate_limiter()
+        self.throttled = 0.0
+        self.lean = lean
+
+    async def _enable_lean_mode(self, target):
+        """
+        Aborts non-essential resource types and third-party tracker domains
+        on a page or whole context, and counts what was blocked vs. loaded
+        for the run summary.
+        """
+        stats = {"blocked": 0, "saved_est": 0, "loaded": 0, "loaded_bytes": 0}
+
+        async def handle(route):
+            req = route.request
+            if req.resource_type in LEAN_BLOCKED_RESOURCE_TYPES or any(
+                d in req.url for d in LEAN_BLOCKED_DOMAINS
+            ):
+                stats["blocked"] += 1
+                stats["saved_est"] += LEAN_EST_BYTES.get(
+                    req.resource_type, LEAN_EST_BYTES_DEFAULT
+                )
+                await route.abort()
+            else:
+                await route.continue_()
+
+        def on_response(response):
+            stats["loaded"] += 1
+            try:
+                stats["loaded_bytes"] += int(response.headers.get("content-length", 0))
+            except ValueError:
+                pass
+
+        await target.route("**/*", handle)
+        target.on("response", on_response)
+        return stats
+
+    async def _load_more(self, page, seen):
+        """
+        Scrolls to the bottom of the feed (clicking "See more jobs" once the
+        infinite scroll gives way to the button) and waits for new cards.
+        Returns False when the feed did not grow.
+        """
+        spec = SITE_SPECS["LinkedIn"]
+
+        if await page.is_visible(LINKEDIN_VIEWED_ALL):
+            return False
+
+        with span("throttle", site="LinkedIn") as s:
+            s["waited"] = await self.limiter.acquire_async(page.url)
+            self.throttled += s["waited"]
+
+        with span("page.load", site="LinkedIn", kind="load_more") as s:
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+            try:
+                if await page.is_visible(LINKEDIN_SHOW_MORE):
+                    await page.click(LINKEDIN_SHOW_MORE, timeout=3000)
+            except Exception:
+                pass
+
+            try:
+                await page.wait_for_function(
+                    "([sel, n]) => document.querySelectorAll(sel).length > n",
+                    arg=[spec["card"], seen],
+                    timeout=5000,
+                )
+                s["state"] = "ready"
+                return True
+            except Exception:
+                s["state"] = "stalled"
+                return False
+
+    def _search_url(self, keyword, location, time_filter, work_type, exp_level):
+        t_param = LINKEDIN_FILTERS["time"].get(time_filter, "")
+        w_param = LINKEDIN_FILTERS["type"].get(work_type, "")
+        e_param = LINKEDIN_FILTERS["level"].get(exp_level, "")
+
+        return (
+            f"https://www.linkedin.com/jobs/search?"
+            f"keywords={keyword}&location={location}{t_param}{w_param}{e_param}"
+        )
+
+    async def _open_context(self, p):
+        """
+        Launches the browser and one context for the run; pages opened from
+        it share cookies and, in lean mode, the resource blocking.
+        """
+        with span("driver.acquire", site="LinkedIn", pooled=False, headless=True):
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(user_agent=LINKEDIN_USER_AGENT)
+
+        lean_stats = await self._enable_lean_mode(context) if self.lean else None
+        return browser, context, lean_stats
+
+    def _print_lean_stats(self, lean_stats):
+        if lean_stats:
+            print(
+                f"[Lean] LinkedIn: loaded {lean_stats['loaded']} requests / "
+                f"{lean_stats['loaded_bytes'] // 1024} KB, blocked "
+                f"{lean_stats['blocked']} requests "
+                f"(~{lean_stats['saved_est'] // 1024} KB est. saved)"
+            )
+
+    async def _scrape_feed(self, page, base_url, limit, data, links, query=None):
+        """
+        Loads one search feed and appends its jobs to `data` (in place, so a
+        failure keeps what was collected) until `limit` or the feed runs dry.
+        `links` is shared across feeds of a batch to drop repeat postings.
+        """
+        spec = SITE_SPECS["LinkedIn"]
+
+        print(f"[LinkedIn] Fetching URL: {base_url}")
+        with span("throttle", site="LinkedIn") as s:
+            s["waited"] = await self.limiter.acquire_async(base_url)
+            self.throttled += s["waited"]
+
+        with span("page.load", site="LinkedIn", kind="goto"):
+            await page.goto(base_url, timeout=60000, wait_until="domcontentloaded")
+
+            try:
+                await page.wait_for_selector(
+                    spec["card"], timeout=PAGE_READY_TIMEOUT * 1000
+                )
+            except Exception:
+                if looks_blocked(page.url, await page.title()):
+                    self.limiter.report_blocked(base_url)
+                    raise RuntimeError(f"Blocked at {page.url}")
+                raise
+
+        self.limiter.report_ok(base_url)
+
+        seen = 0
+        stalls = 0
+
+        while len(data) < limit:
+            with span("page.parse", site="LinkedIn", mode="batch") as s:
+                batch = await page.evaluate(
+                    BATCH_EXTRACT_JS, [spec["card"], spec["fields"], seen]
+                )
+                s["cards"] = len(batch)
+            seen += len(batch)
+            print(f"[LinkedIn] Found {len(batch)} new job cards ({seen} total)")
+
+            known = 0
+            for raw in batch:
+                if len(data) >= limit:
+                    break
+
+                try:
+                    job = build_linkedin_job(apply_defaults(raw, spec))
+                    if job["job_url"] in links:
+                        continue
+
+                    links.add(job["job_url"])
+                    if self.known_urls is not None:
+                        if job["job_url"] in self.known_urls:
+                            known += 1
+                            continue
+
+                    if query is not None:
+                        job["query"] = query
+                    data.append(job)
+                    print(f"[LinkedIn] Scraped: {job['title']}")
+
+                except Exception as e:
+                    print(f"[LinkedIn] Error parsing job: {e}")
+
+            if len(data) >= limit:
+                break
+
+            if self.known_urls is not None and self.known_urls.is_mostly_known(
+                known, len(batch)
+            ):
+                print(f"[LinkedIn] {known}/{len(batch)} cards already known, stopping")
+                break
+
+            if await self._load_more(page, seen):
+                stalls = 0
+                continue
+
+            stalls += 1
+            if stalls >= LINKEDIN_MAX_STALLS:
+                print("[LinkedIn] Feed exhausted")
+                break
+
+        if self.record:
+            record_page("LinkedIn", await page.content(), page.url)
+
     async def scrape(
         self,
         keyword,
@@ -544,111 +1008,201 @@ class LinkedInScraper:
     ):
         print(f"[LinkedIn] Scraping '{keyword}'")
         data = []
-
-        t_param = LINKEDIN_FILTERS["time"].get(time_filter, "")
-        w_param = LINKEDIN_FILTERS["type"].get(work_type, "")
-        e_param = LINKEDIN_FILTERS["level"].get(exp_level, "")
-
-        base_url = (
-            f"https://www.linkedin.com/jobs/search?"
-            f"keywords={keyword}&location={location}{t_param}{w_param}{e_param}"
-        )
+        self.throttled = 0.0
+        base_url = self._search_url(keyword, location, time_filter, work_type, exp_level)
 
         try:
             async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page(
-                    user_agent=(
-                        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/115.0.0.0 Safari/537.36"
-                    )
-                )
+                browser, context, lean_stats = await self._open_context(p)
+                page = await context.new_page()
 
-                print(f"[LinkedIn] Fetching URL: {base_url}")
-                await page.goto(base_url, timeout=60000, wait_until="networkidle")
+                await self._scrape_feed(page, base_url, limit, data, set())
 
-                for _ in range(3):
-                    await page.keyboard.press("PageDown")
-                    await asyncio.sleep(1)
+                self._print_lean_stats(lean_stats)
+                await browser.close()
 
-                cards = await page.query_selector_all(".base-search-card")
-                print(f"[LinkedIn] Found {len(cards)} job cards")
+        except Exception as e:
+            print(f"[LinkedIn] Fatal error: {e}")
 
-                for card in cards[:limit]:
-                    try:
-                        title_el = await card.query_selector(
-                            ".base-search-card__title"
-                        )
-
-                        company_el = await card.query_selector(
-                            ".base-search-card__subtitle"
-                        )
-
-                        loc_el = await card.query_selector(
-                            ".job-search-card__location"
-                        )
-
-                        link_el = await card.query_selector(
-                            ".base-card__full-link"
-                        )
-
-                        salary = "Not Disclosed"
-                        date_text = "Today"
-
-                        date_el = await card.query_selector("time")
-                        if date_el:
-                            dt = await date_el.get_attribute("datetime")
-                            date_text = dt or await date_el.inner_text()
-
-                        title = (
-                            await title_el.inner_text() if title_el else "N/A"
-                        )
-
-                        company = (
-                            await company_el.inner_text()
-                            if company_el
-                            else "N/A"
-                        )
-
-                        loc = (
-                            await loc_el.inner_text() if loc_el else "N/A"
-                        )
-
-                        link = (
-                            await link_el.get_attribute("href")
-                            if link_el
-                            else "#"
-                        )
-
-                        if "?" in link:
-                            link = link.split("?")[0]
-
-                        data.append(
-                            {
-                                "title": title.strip(),
-                                "company": company.strip(),
-                                "location": loc.strip(),
-                                "salary": salary,
-                                "experience": "N/A",
-                                "description": title.strip(),
-                                "job_url": link,
-                                "site": "LinkedIn",
-                                "date_posted": parse_relative_date(
-                                    date_text.strip()
-                                ),
-                            }
-                        )
-
-                        print(f"[LinkedIn] Scraped: {title}")
+        print(f"[LinkedIn] Total scraped: {len(data)}")
+        print(f"[LinkedIn] Time spent throttling: {self.throttled:.1f}s")
+        return data
 
-                    except Exception as e:
-                        print(f"[LinkedIn] Error parsing job: {e}")
+    async def scrape_batch(
+        self,
+        queries,
+        limit=10,
+        time_filter="Any Time",
+        work_type="Any",
+        exp_level="Any",
+        tabs=LINKEDIN_BATCH_TABS,
+    ):
+        """
+        Scrapes several queries ({"keyword", "location"} dicts) in one
+        browser context, a few feeds open at a time so their page loads
+        interleave under the domain's rate limiter. `limit` applies per
+        query; jobs are tagged with the keyword that first found them.
+        """
+        print(f"[LinkedIn] Batch scraping {len(queries)} queries (limit={limit} each)")
+        self.throttled = 0.0
+        results = [[] for _ in queries]
+        links = set()
+
+        async def run(query, data, sem, context):
+            async with sem:
+                page = await context.new_page()
+                try:
+                    url = self._search_url(
+                        query["keyword"], query.get("location", "India"),
+                        time_filter, work_type, exp_level
+                    )
+                    await self._scrape_feed(page, url, limit, data, links, query["keyword"])
+                except Exception as e:
+                    print(f"[LinkedIn] Error scraping '{query['keyword']}': {e}")
+                finally:
+                    await page.close()
+
+        try:
+            async with async_playwright() as p:
+                browser, context, lean_stats = await self._open_context(p)
+                sem = asyncio.Semaphore(tabs)
+
+                await asyncio.gather(
+                    *(run(q, data, sem, context) for q, data in zip(queries, results))
+                )
 
+                self._print_lean_stats(lean_stats)
                 await browser.close()
 
         except Exception as e:
             print(f"[LinkedIn] Fatal error: {e}")
 
-        print(f"[LinkedIn] Total scraped: {len(data)}")
+        data = [job for jobs in results for job in jobs]
+        print(f"[LinkedIn] Batch total: {len(data)} jobs for {len(queries)} queries")
+        print(f"[LinkedIn] Time spent throttling: {self.throttled:.1f}s")
         return data
+
+
+JOBKAKA_CONCURRENT_PAGES = 3
+JOBKAKA_CARDS_PER_PAGE = 10
+
+
+class JobKakaHttpScraper:
+    """
+    Reads JobKaka's server-rendered listing pages over a pooled keep-alive
+    HTTP session, a few pages at a time, and parses them offline. Chrome is
+    only started if the site blocks the plain fetch.
+    """
+
+    def __init__(self, limiter=None, known_urls=None, record=False,
+                 concurrent_pages=JOBKAKA_CONCURRENT_PAGES):
+        self.limiter = limiter or get_rate_limiter()
+        self.known_urls = known_urls
+        self.record = record
+        self.concurrent_pages = concurrent_pages
+
+    async def _fetch_page(self, session, page, query):
+        url = jobkaka_url(page, query)
+        print(f"[JobKaka] Page {page}: {url}")
+
+        with span("page.load", site="JobKaka", page=page, mode="http"):
+            html = await fetch_text(session, url, limiter=self.limiter)
+        if self.record:
+            record_page("JobKaka", html, url)
+
+        with span("page.parse", site="JobKaka", page=page, mode="snapshot") as s:
+            cards = parse_cards(html, SITE_SPECS["JobKaka"])
+            s["cards"] = len(cards)
+        return url, cards
+
+    def _collect(self, url, cards, query, jobs, limit):
+        spec = SITE_SPECS["JobKaka"]
+        known = 0
+
+        for card in cards:
+            if len(jobs) >= limit:
+                break
+
+            try:
+                if self.known_urls is not None:
+                    link = extract_fields_soup(card, spec, url, only=("link",))["link"]
+                    if link in self.known_urls:
+                        known += 1
+                        continue
+
+                job = build_jobkaka_job(extract_fields_soup(card, spec, url), query)
+                jobs.append(job)
+
+                print(f"[JobKaka] Scraped: {job['title']}")
+
+            except Exception as e:
+                print(f"[JobKaka] Error parsing job: {e}")
+
+        return known
+
+    async def scrape(self, limit=30, query=None):
+        if query:
+            print(f"[JobKaka] Searching for '{query}' over HTTP (Limit: {limit})")
+        else:
+            print(f"[JobKaka] Scraping Latest Jobs over HTTP (Limit: {limit})")
+
+        jobs = []
+        page = 1
+        per_page = JOBKAKA_CARDS_PER_PAGE
+
+        try:
+            async with make_session() as session:
+                while len(jobs) < limit:
+                    wanted = math.ceil((limit - len(jobs)) / per_page)
+                    pages = list(range(page, page + min(self.concurrent_pages, wanted)))
+
+                    results = await asyncio.gather(
+                        *(self._fetch_page(session, n, query) for n in pages),
+                        return_exceptions=True,
+                    )
+
+                    done = False
+                    for n, res in zip(pages, results):
+                        if isinstance(res, FetchBlocked) and not jobs:
+                            raise res
+
+                        if isinstance(res, Exception):
+                            print(f"[JobKaka] Error loading page {n}: {res}")
+                            done = True
+                            break
+
+                        url, cards = res
+                        if not cards:
+                            print("[JobKaka] No more jobs found")
+                            done = True
+                            break
+
+                        per_page = len(cards)
+                        known = self._collect(url, cards, query, jobs, limit)
+
+                        if len(jobs) >= limit:
+                            done = True
+                            break
+
+                        if self.known_urls is not None and self.known_urls.is_mostly_known(
+                            known, len(cards)
+                        ):
+                            print(f"[JobKaka] {known}/{len(cards)} cards already known, stopping")
+                            done = True
+                            break
+
+                    if done:
+                        break
+
+                    page += len(pages)
+
+        except FetchBlocked as e:
+            print(f"[JobKaka] Plain HTTP blocked ({e}), falling back to Chrome")
+            scraper = SeleniumScraper(known_urls=self.known_urls, record=self.record)
+            return await asyncio.to_thread(scraper.scrape_jobkaka, limit, query)
+
+        except Exception as e:
+            print(f"[JobKaka] Fatal error: {e}")
+
+        print(f"[JobKaka] Total scraped: {len(jobs)}")
+        return jobs
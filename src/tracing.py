@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.database import DATA_DIR
+
+TRACE_PATH = os.path.join(DATA_DIR, "traces.jsonl")
+METRICS_PATH = os.path.join(DATA_DIR, "metrics.prom")
+
+# Stages that count towards a site's busy time when computing cards/sec.
+PAGE_STAGES = ("page.load", "page.parse", "card.extract")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[idx]
+
+
+class Run:
+    """
+    Collects timed spans for one scrape run. Spans carry free-form
+    attributes (site, page, cards, ...) and can be recorded from any thread.
+    """
+
+    def __init__(self, name, **attrs):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+
+    def record(self, name, duration, attrs):
+        with self._lock:
+            self.spans.append({"name": name, "duration": duration, **attrs})
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        Times the block. The yielded dict can be updated inside the block to
+        attach results (e.g. the number of cards parsed).
+        """
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.record(name, time.perf_counter() - start, attrs)
+
+    def summary(self):
+        with self._lock:
+            spans = list(self.spans)
+
+        by_name = {}
+        for s in spans:
+            by_name.setdefault(s["name"], []).append(s["duration"])
+
+        sites = {}
+        for s in spans:
+            site = s.get("site")
+            if not site or s["name"] not in PAGE_STAGES:
+                continue
+            stats = sites.setdefault(site, {"loads": [], "busy": 0.0, "cards": 0})
+            stats["busy"] += s["duration"]
+            if s["name"] == "page.load":
+                stats["loads"].append(s["duration"])
+            else:
+                stats["cards"] += s.get("cards", 0)
+
+        return {
+            "run_id": self.run_id,
+            "name": self.name,
+            "attrs": self.attrs,
+            "started_at": self.started_at,
+            "duration_s": round(time.perf_counter() - self._start, 3),
+            "spans": {
+                name: {
+                    "count": len(d),
+                    "total_s": round(sum(d), 3),
+                    "p50_s": round(percentile(d, 0.5), 4),
+                    "p95_s": round(percentile(d, 0.95), 4),
+                }
+                for name, d in by_name.items()
+            },
+            "sites": {
+                site: {
+                    "pages": len(st["loads"]),
+                    "page_load_p50_s": round(percentile(st["loads"], 0.5) or 0, 3),
+                    "page_load_p95_s": round(percentile(st["loads"], 0.95) or 0, 3),
+                    "cards": st["cards"],
+                    "cards_per_sec": round(st["cards"] / st["busy"], 2) if st["busy"] else 0.0,
+                }
+                for site, st in sites.items()
+            },
+        }
+
+    def export_jsonl(self, path=TRACE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            spans = list(self.spans)
+
+        with open(path, "a", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps({"run_id": self.run_id, "run": self.name, **s}, default=str) + "\n")
+            f.write(json.dumps({"run_id": self.run_id, "summary": self.summary()}, default=str) + "\n")
+
+    def export_prometheus(self, path=METRICS_PATH):
+        """
+        Writes the run summary in Prometheus text format, e.g. for the
+        node_exporter textfile collector. Overwritten on every run.
+        """
+        summary = self.summary()
+        lines = [
+            "# HELP scrape_span_seconds Duration of traced scrape stages.",
+            "# TYPE scrape_span_seconds summary",
+        ]
+        for name, st in summary["spans"].items():
+            labels = f'stage="{name}"'
+            lines.append(f'scrape_span_seconds{{{labels},quantile="0.5"}} {st["p50_s"]}')
+            lines.append(f'scrape_span_seconds{{{labels},quantile="0.95"}} {st["p95_s"]}')
+            lines.append(f"scrape_span_seconds_sum{{{labels}}} {st['total_s']}")
+            lines.append(f"scrape_span_seconds_count{{{labels}}} {st['count']}")
+
+        lines += [
+            "# HELP scrape_cards_per_second Cards parsed per second of page time.",
+            "# TYPE scrape_cards_per_second gauge",
+        ]
+        for site, st in summary["sites"].items():
+            lines.append(f'scrape_cards_per_second{{site="{site}"}} {st["cards_per_sec"]}')
+
+        lines += [
+            "# HELP scrape_run_duration_seconds Wall-clock duration of the last run.",
+            "# TYPE scrape_run_duration_seconds gauge",
+            f'scrape_run_duration_seconds{{run="{self.name}"}} {summary["duration_s"]}',
+        ]
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+
+# One run is active per process at a time (a worker runs one job at once);
+# spans recorded while no run is active are dropped.
+_active_run = None
+
+
+def start_run(name, **attrs):
+    global _active_run
+    _active_run = Run(name, **attrs)
+    return _active_run
+
+
+def end_run(export=True):
+    global _active_run
+    run, _active_run = _active_run, None
+    if run is None:
+        return None
+
+    if export:
+        try:
+            run.export_jsonl()
+            run.export_prometheus()
+        except OSError as e:
+            print(f"[Tracing] Export failed: {e}")
+
+    return run.summary()
+
+
+@contextmanager
+def span(name, **attrs):
+    run = _active_run
+    if run is None:
+        yield attrs
+        return
+
+    with run.span(name, **attrs) as a:
+        yield a
@@ -0,0 +1,145 @@
+import os
+import time
+import asyncio
+import argparse
+import threading
+import traceback
+import multiprocessing
+
+from src.database import init_db
+from src.job_queue import (
+    claim_scrape_job,
+    update_scrape_job_progress,
+    finish_scrape_job,
+    fail_scrape_job,
+    requeue_stale_scrape_jobs,
+)
+from src.tracing import start_run, end_run
+
+DEFAULT_WORKERS = 2
+POLL_INTERVAL = 2.0
+HEARTBEAT_INTERVAL = 30.0
+SUPERVISOR_INTERVAL = 10.0
+
+
+def _heartbeat(job_id, worker, stop):
+    conn = init_db()
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            update_scrape_job_progress(conn, job_id, worker)
+    finally:
+        conn.close()
+
+
+def run_job(conn, job):
+    from src.pipeline import SCRAPE_RUNNERS
+
+    runner = SCRAPE_RUNNERS.get(job["kind"])
+    if runner is None:
+        fail_scrape_job(conn, job["id"], job["worker"], f"Unknown job kind '{job['kind']}'")
+        return
+
+    def progress(percent, message):
+        update_scrape_job_progress(conn, job["id"], job["worker"], percent, message)
+
+    # Scrapes can sit inside one site for minutes; keep the heartbeat going
+    # independently of progress updates so the job isn't considered dead.
+    stop = threading.Event()
+    beat = threading.Thread(target=_heartbeat, args=(job["id"], job["worker"], stop), daemon=True)
+    beat.start()
+
+    start_run(job["kind"], job_id=job["id"])
+
+    try:
+        jobs, counts = asyncio.run(runner(**job["params"], progress=progress))
+        trace = end_run()
+        result = {"jobs": jobs, "counts": counts, "trace": trace}
+        if finish_scrape_job(conn, job["id"], job["worker"], result):
+            print(f"[Worker {os.getpid()}] Job {job['id']} done: {len(jobs)} jobs")
+        else:
+            print(f"[Worker {os.getpid()}] Job {job['id']} was requeued meanwhile; result dropped")
+
+    except Exception as e:
+        traceback.print_exc()
+        end_run()
+        if not fail_scrape_job(conn, job["id"], job["worker"], e):
+            print(f"[Worker {os.getpid()}] Job {job['id']} was requeued meanwhile; error dropped")
+
+    finally:
+        stop.set()
+
+
+def worker_loop(name, poll_interval=POLL_INTERVAL):
+    conn = init_db()
+    print(f"[Worker {name}] Started (pid {os.getpid()})")
+
+    try:
+        while True:
+            job = claim_scrape_job(conn, name)
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+
+            print(f"[Worker {name}] Running job {job['id']} ({job['kind']})")
+            run_job(conn, job)
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        conn.close()
+
+
+def supervise(n_workers=DEFAULT_WORKERS, poll_interval=POLL_INTERVAL):
+    """
+    Keeps `n_workers` worker processes alive, restarting any that die, and
+    periodically requeues jobs whose worker stopped sending heartbeats.
+    """
+    conn = init_db()
+    requeued = requeue_stale_scrape_jobs(conn)
+    if requeued:
+        print(f"[Supervisor] Requeued {requeued} stale jobs")
+
+    procs = {}
+
+    def spawn(i):
+        p = multiprocessing.Process(
+            target=worker_loop, args=(f"w{i}", poll_interval), daemon=False
+        )
+        p.start()
+        procs[i] = p
+
+    for i in range(n_workers):
+        spawn(i)
+
+    try:
+        while True:
+            time.sleep(SUPERVISOR_INTERVAL)
+
+            for i, p in list(procs.items()):
+                if not p.is_alive():
+                    print(f"[Supervisor] Worker w{i} exited ({p.exitcode}), restarting")
+                    spawn(i)
+
+            requeued = requeue_stale_scrape_jobs(conn)
+            if requeued:
+                print(f"[Supervisor] Requeued {requeued} stale jobs")
+
+    except KeyboardInterrupt:
+        print("[Supervisor] Shutting down workers")
+
+    finally:
+        for p in procs.values():
+            p.terminate()
+        for p in procs.values():
+            p.join(timeout=10)
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background scrape workers.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--poll", type=float, default=POLL_INTERVAL)
+    args = parser.parse_args()
+
+    supervise(args.workers, args.poll)